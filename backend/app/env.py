@@ -22,6 +22,18 @@ S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "minioadmin")
 S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minioadmin")
 S3_REGION = os.getenv("S3_REGION", "us-east-1")
 S3_USE_SSL = os.getenv("S3_USE_SSL", "false").lower() == "true"
+# Comma-separated usernames whose buckets are checked/created at startup
+S3_WARM_USERS = [
+    u.strip() for u in os.getenv("S3_WARM_USERS", "").split(",") if u.strip()
+]
+
+# =============================================================================
+# CORS Configuration
+# =============================================================================
+# Comma-separated allowed origins; "*" (the default) allows any origin
+CORS_ORIGINS = [
+    o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()
+]
 
 # =============================================================================
 # Authentication Configuration
@@ -39,6 +51,13 @@ ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", None)
 ADMIN_FULL_NAME = os.getenv("ADMIN_FULL_NAME", "System Administrator")
 SKIP_ADMIN_SETUP = os.getenv("SKIP_ADMIN_SETUP", "false").lower() == "true"
 
+# =============================================================================
+# PDF Export Configuration
+# =============================================================================
+# Optional precompiled XeLaTeX format (passed as ``-fmt``). Only set this when
+# the format was dumped from a preamble that matches pandoc's LaTeX template.
+XELATEX_FORMAT = os.getenv("XELATEX_FORMAT", None)
+
 # =============================================================================
 # Logging Configuration
 # =============================================================================
@@ -1,9 +1,10 @@
+import asyncio
 from pathlib import Path
 from langgraph.runtime import Runtime
 
 from .states import ExporterState
 from app.utils import create_simple_logger
-from app.services.markdown_to_pdf import convert_markdown_to_pdf
+from app.services.markdown_to_pdf import aconvert_markdown_to_pdf
 from app.services.storage_service import get_storage_service
 from app.graph.nodes.notes import save_final_notes_path
 from app.graph.nodes.summarizer import save_summary_path
@@ -58,29 +59,36 @@ async def exporter_agent(state: ExporterState, runtime: Runtime) -> ExporterStat
     collected_notes_path = Path(collected_notes_path)
     summary_path = Path(summary_path)
 
-    # convert collected notes to PDF
-    collected_notes_pdf_path = convert_markdown_to_pdf(
-        md_path=collected_notes_path,
-        remove_embedded_md=True,
-        preamble=DEFAULT_PREAMBLE,
+    # convert collected notes and summary to PDF concurrently
+    collected_notes_pdf_path, summary_pdf_path = await asyncio.gather(
+        aconvert_markdown_to_pdf(
+            md_path=collected_notes_path,
+            remove_embedded_md=True,
+            preamble=DEFAULT_PREAMBLE,
+        ),
+        aconvert_markdown_to_pdf(
+            md_path=summary_path,
+            remove_embedded_md=True,
+            preamble=DEFAULT_PREAMBLE_WITHOUT_TOC,
+        ),
     )
     logger.info(f"Collected notes PDF saved at: {collected_notes_pdf_path}")
+    logger.info(f"Summary PDF saved at: {summary_pdf_path}")
 
     # Upload final_notes.pdf to MinIO
-    upload_pdf_to_minio(
-        collected_notes_pdf_path, username, video_id, run_id, "final_notes.pdf"
+    await asyncio.to_thread(
+        upload_pdf_to_minio,
+        collected_notes_pdf_path,
+        username,
+        video_id,
+        run_id,
+        "final_notes.pdf",
     )
 
-    # convert summary to PDF
-    summary_pdf_path = convert_markdown_to_pdf(
-        md_path=summary_path,
-        remove_embedded_md=True,
-        preamble=DEFAULT_PREAMBLE_WITHOUT_TOC,
-    )
-    logger.info(f"Summary PDF saved at: {summary_pdf_path}")
-
     # Upload summary.pdf to MinIO
-    upload_pdf_to_minio(summary_pdf_path, username, video_id, run_id, "summary.pdf")
+    await asyncio.to_thread(
+        upload_pdf_to_minio, summary_pdf_path, username, video_id, run_id, "summary.pdf"
+    )
 
     return {
         "collected_notes_pdf_path": str(collected_notes_pdf_path),
@@ -1,3 +1,4 @@
+import asyncio
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.runtime import Runtime
 
@@ -18,7 +19,8 @@ async def formatter_agent(
     state: FormatterState, runtime: Runtime
 ) -> FormatterStateFinal:
     """Formats the given text using an LLM based on the provided runtime configuration."""
-    formatted_text = cache_intermediate_text(
+    formatted_text = await asyncio.to_thread(
+        cache_intermediate_text,
         video_id=runtime.context["video_id"],
         note_type="formatted",
         chunk_idx=state["chunk_idx"],
@@ -41,7 +43,8 @@ async def formatter_agent(
 
     response = await llm.ainvoke([system_message, human_message])
     formatted_text = handle_llm_markdown_response(response)
-    save_intermediate_text(
+    await asyncio.to_thread(
+        save_intermediate_text,
         video_id=runtime.context["video_id"],
         chunk_idx=current_chunk,
         text=formatted_text,
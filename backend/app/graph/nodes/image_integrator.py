@@ -1,4 +1,5 @@
 from typing import List
+import asyncio
 import json
 import re
 from textwrap import dedent
@@ -6,7 +7,7 @@ from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.runtime import Runtime
 import os
 
-from app.services import create_llm_instance, extract_frame
+from app.services import create_llm_instance, aextract_frame
 from .utils import (
     save_intermediate_text,
     create_path_to_save_notes,
@@ -104,7 +105,8 @@ async def timestamp_generator_agent(
     runtime: Runtime,
 ) -> ImageIntegratorOverallState:
     """Generates timestamps for important moments in the chunk text based on the chunk notes."""
-    timestamps = cache_generated_json(
+    timestamps = await asyncio.to_thread(
+        cache_generated_json,
         video_id=runtime.context["video_id"],
         json_type="timestamps",
         chunk_idx=state["chunk_idx"],
@@ -135,7 +137,8 @@ async def timestamp_generator_agent(
         assert isinstance(
             response, TimestampGeneratorOutput
         ), "LLM response is not of type TimestampGeneratorOutput"
-        save_generated_json_objects(
+        await asyncio.to_thread(
+            save_generated_json_objects,
             video_id=runtime.context["video_id"],
             chunk_idx=state["chunk_idx"],
             data=response.model_dump(),
@@ -168,7 +171,8 @@ async def timestamp_generator_agent(
         except Exception:
             logger.error("Failed to parse timestamps JSON; returning empty list")
             parsed = TimestampGeneratorOutput(timestamps=[])
-        save_generated_json_objects(
+        await asyncio.to_thread(
+            save_generated_json_objects,
             video_id=runtime.context["video_id"],
             chunk_idx=state["chunk_idx"],
             data=parsed.model_dump(),
@@ -229,7 +233,8 @@ async def image_insertion_generation_agent(
     runtime: Runtime,
 ) -> ImageIntegratorOverallState:
     """Uses LLM to decide where to insert images in the chunk notes based on the timestamps and captions."""
-    image_insertions = cache_generated_json(
+    image_insertions = await asyncio.to_thread(
+        cache_generated_json,
         video_id=runtime.context["video_id"],
         json_type="image_insertions",
         chunk_idx=state["chunk_idx"],
@@ -265,7 +270,8 @@ async def image_insertion_generation_agent(
         assert isinstance(
             response, ImageIntegratorOutput
         ), "LLM response is not of type ImageIntegratorOutput"
-        save_generated_json_objects(
+        await asyncio.to_thread(
+            save_generated_json_objects,
             video_id=runtime.context["video_id"],
             chunk_idx=state["chunk_idx"],
             data=response.model_dump(),
@@ -297,7 +303,8 @@ async def image_insertion_generation_agent(
         except Exception:
             logger.error("Failed to parse image insertions JSON; returning empty list")
             parsed = ImageIntegratorOutput(image_insertions=[])
-        save_generated_json_objects(
+        await asyncio.to_thread(
+            save_generated_json_objects,
             video_id=runtime.context["video_id"],
             chunk_idx=state["chunk_idx"],
             data=parsed.model_dump(),
@@ -321,7 +328,7 @@ async def extract_frames(
     image_extractions = []
     for ts in state["timestamps"]:
         try:
-            frame_path, _ = extract_frame(
+            frame_path, _ = await aextract_frame(
                 video_id=video_id,
                 video_path=video_path,
                 timestamp=ts.timestamp,
@@ -388,7 +395,8 @@ async def image_integrator_agent(
 ) -> OverAllState:
     "Uses helper methods to extract frames and integrate them into the chunk notes."
     # Step 0: If integrated notes already exist, skip processing
-    image_integrated_notes = cache_intermediate_text(
+    image_integrated_notes = await asyncio.to_thread(
+        cache_intermediate_text,
         video_id=runtime.context["video_id"],
         chunk_idx=state["chunk_idx"],
         note_type="integrated",
@@ -433,7 +441,8 @@ async def image_integrator_agent(
     image_integrated_notes = _integrate_images_into_notes(
         state["chunk_note"], inserted_image
     )
-    save_intermediate_text(
+    await asyncio.to_thread(
+        save_intermediate_text,
         video_id=runtime.context["video_id"],
         chunk_idx=state["chunk_idx"],
         text=image_integrated_notes,
@@ -1,3 +1,4 @@
+import asyncio
 import os
 
 from langchain_core.messages import SystemMessage, HumanMessage
@@ -61,7 +62,8 @@ async def chunk_notes_agent(
     refresh_notes = runtime.context.get("refresh_notes", False)
     chunk_idx = state.get("chunk_idx", 0)
 
-    saved_note = cache_intermediate_text(
+    saved_note = await asyncio.to_thread(
+        cache_intermediate_text,
         video_id=runtime.context["video_id"],
         note_type="raw",
         chunk_idx=chunk_idx,
@@ -81,7 +83,8 @@ async def chunk_notes_agent(
     human_message = HumanMessage(content=chunk)
     response = await llm.ainvoke([system_message, human_message])
     chunk_note = handle_llm_markdown_response(response)
-    save_intermediate_text(
+    await asyncio.to_thread(
+        save_intermediate_text,
         video_id=runtime.context["video_id"],
         chunk_idx=chunk_idx,
         text=chunk_note,
@@ -111,7 +114,8 @@ async def notes_collector_agent(
     state: NotesCollectorAgentState, runtime: Runtime
 ) -> dict[str, str]:
     """Collects and merges notes from multiple chunks using an LLM based on the provided runtime configuration."""
-    collected_notes = cache_intermediate_text(
+    collected_notes = await asyncio.to_thread(
+        cache_intermediate_text,
         video_id=runtime.context["video_id"],
         note_type="final",
         refresh_notes=runtime.context.get("refresh_notes", False),
@@ -139,7 +143,8 @@ async def notes_collector_agent(
 
     collected_notes = handle_llm_markdown_response(response)
     updated_notes = _update_image_links_in_final_notes(collected_notes)
-    save_final_notes(
+    await asyncio.to_thread(
+        save_final_notes,
         video_id=runtime.context["video_id"],
         text=updated_notes,
         username=runtime.context.get("username"),
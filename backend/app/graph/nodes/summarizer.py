@@ -1,3 +1,4 @@
+import asyncio
 import os
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.runtime import Runtime
@@ -54,7 +55,8 @@ def save_summary(
 
 async def summarizer_agent(state: SummarizerState, runtime: Runtime) -> SummarizerState:
     """Generates a summary of the given text using an LLM based on the provided runtime configuration."""
-    saved_summary = cache_intermediate_text(
+    saved_summary = await asyncio.to_thread(
+        cache_intermediate_text,
         video_id=runtime.context["video_id"],
         note_type="summary",
         refresh_notes=runtime.context.get("refresh_notes", False),
@@ -79,7 +81,8 @@ async def summarizer_agent(state: SummarizerState, runtime: Runtime) -> Summariz
     response = await llm.ainvoke([system_message, human_message])
 
     summary = handle_llm_markdown_response(response)
-    save_summary(
+    await asyncio.to_thread(
+        save_summary,
         video_id=runtime.context["video_id"],
         text=summary,
         username=runtime.context.get("username"),
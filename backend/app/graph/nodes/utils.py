@@ -127,7 +127,7 @@ def cache_intermediate_text(
                     logger.info(log_msg)
                     return (
                         content.decode("utf-8")
-                        if isinstance(content, bytes)
+                        if isinstance(content, (bytes, bytearray))
                         else content
                     )
         except Exception as e:
@@ -203,7 +203,9 @@ def cache_from_minio(
                     f"Found cached '{filename}' in MinIO for user '{username}', run '{run_id}'"
                 )
                 return (
-                    content.decode("utf-8") if isinstance(content, bytes) else content
+                    content.decode("utf-8")
+                    if isinstance(content, (bytes, bytearray))
+                    else content
                 )
     except Exception as e:
         logger.warning(f"MinIO cache check failed: {e}")
@@ -362,7 +364,7 @@ def cache_generated_json(
                     logger.info(log_msg)
                     return json.loads(
                         content.decode("utf-8")
-                        if isinstance(content, bytes)
+                        if isinstance(content, (bytes, bytearray))
                         else content
                     )
         except Exception as e:
@@ -115,6 +115,18 @@ STATE_KEYS = {
     "summary_pdf_path",
 }
 
+# Progress message shown for each phase reported by _compute_progress
+PHASE_MESSAGES = {
+    "starting": "Preparing…",
+    "chunks": "Chunks created",
+    "chunk_notes": "Chunk notes generated",
+    "image_integration": "Images integrated into notes",
+    "format_docs": "Notes formatted",
+    "collect_notes": "Notes collected",
+    "summary": "Summary generated",
+    "collected_notes_pdf_path": "Notes exported to PDF",
+}
+
 
 def _update_state_from_obj(
     obj: Any, state: OverAllState, depth: int = 0, max_depth: int = 3
@@ -207,18 +219,18 @@ def _shape_data_for_stream(
     return out
 
 
+def _safe_len(x: Any) -> int:
+    try:
+        return len(x)  # type: ignore[arg-type]
+    except Exception:
+        return 0
+
+
 def _compute_counters(state: OverAllState, expected_chunks: int) -> Dict[str, Any]:
     """Compute progress counters for UI display.
 
     Returns a nested dict with current vs total for key artifacts.
     """
-
-    def _safe_len(x: Any) -> int:
-        try:
-            return len(x)  # type: ignore[arg-type]
-        except Exception:
-            return 0
-
     # Notes
     chunk_notes = state.get("chunk_notes") or []
     image_integrated_notes = state.get("image_integrated_notes") or []
@@ -238,34 +250,40 @@ def _compute_counters(state: OverAllState, expected_chunks: int) -> Dict[str, An
     total_image_insertions = sum(_safe_len(lst) for lst in image_insertions_output)
     total_extracted_images = sum(_safe_len(lst) for lst in extracted_images_output)
 
+    # Each length feeds several counters; compute them once per event
+    total = max(int(expected_chunks), 0)
+    n_chunk_notes = _safe_len(chunk_notes)
+    n_integrated = _safe_len(image_integrated_notes)
+    n_formatted = _safe_len(formatted_notes)
+
     counters = {
-        "expected_chunks": max(int(expected_chunks), 0),
+        "expected_chunks": total,
         "notes_created": {
-            "current": _safe_len(chunk_notes),
-            "total": max(int(expected_chunks), 0),
+            "current": n_chunk_notes,
+            "total": total,
         },
         "timestamps_created": {
             "current_items": total_timestamps,
             "chunks_completed": _safe_len(timestamps_output),
-            "total_chunks": max(int(expected_chunks), 0),
+            "total_chunks": total,
         },
         "image_insertions_created": {
             "current_items": total_image_insertions,
             "chunks_completed": _safe_len(image_insertions_output),
-            "total_chunks": max(int(expected_chunks), 0),
+            "total_chunks": total,
         },
         "extracted_images_created": {
             "current_items": total_extracted_images,
             "chunks_completed": _safe_len(extracted_images_output),
-            "total_chunks": max(int(expected_chunks), 0),
+            "total_chunks": total,
         },
         "integrated_image_notes_created": {
-            "current": _safe_len(image_integrated_notes),
-            "total": max(int(expected_chunks), 0),
+            "current": n_integrated,
+            "total": total,
         },
         "formatted_notes_created": {
-            "current": _safe_len(formatted_notes),
-            "total": max(int(expected_chunks), 0),
+            "current": n_formatted,
+            "total": total,
         },
         "finalization": {
             "collected": bool(collected_notes),
@@ -274,14 +292,13 @@ def _compute_counters(state: OverAllState, expected_chunks: int) -> Dict[str, An
             "summary_pdf": bool(summary_pdf_path),
         },
         "notes_by_type": {
-            "raw": _safe_len(chunk_notes),
-            "integrated": _safe_len(image_integrated_notes),
-            "formatted": _safe_len(formatted_notes),
+            "raw": n_chunk_notes,
+            "integrated": n_integrated,
+            "formatted": n_formatted,
             "collected": 1 if collected_notes else 0,
             "summary": 1 if summary else 0,
-            "exported_pdfs": sum(
-                1 for path in [collected_notes_pdf_path, summary_pdf_path] if path
-            ),
+            "exported_pdfs": (1 if collected_notes_pdf_path else 0)
+            + (1 if summary_pdf_path else 0),
         },
     }
     return counters
@@ -412,21 +429,10 @@ async def stream_run_graph(
 
             progress, phase = _compute_progress(state, int(num_chunks))
 
-            message_map = {
-                "starting": "Preparing…",
-                "chunks": "Chunks created",
-                "chunk_notes": "Chunk notes generated",
-                "image_integration": "Images integrated into notes",
-                "format_docs": "Notes formatted",
-                "collect_notes": "Notes collected",
-                "summary": "Summary generated",
-                "collected_notes_pdf_path": "Notes exported to PDF",
-            }
-
             yield {
                 "phase": phase,
                 "progress": progress,
-                "message": message_map.get(phase, "Working…"),
+                "message": PHASE_MESSAGES.get(phase, "Working…"),
                 "data": _shape_data_for_stream(state, stream_config),
                 "counters": _compute_counters(state, int(num_chunks)),
                 "stream": {
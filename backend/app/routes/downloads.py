@@ -10,7 +10,7 @@ import io
 from functools import partial
 from typing import Any, AsyncGenerator, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
@@ -27,6 +27,11 @@ from app.services.storage_service import (
 from app.services.database.project_database import get_project, update_project
 from app.utils import create_simple_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 videos_router = APIRouter(prefix="/videos", tags=["videos"])
 files_router = APIRouter(prefix="/files", tags=["files"])
 
@@ -57,8 +62,28 @@ class DownloadVideoRequest(BaseModel):
 # =============================================================================
 
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (q=0 means "not acceptable")."""
+    qvalues: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.lower()] = q
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
 @files_router.get("/download")
 async def download_file(
+    request: Request,
     project_id: str = Query(..., description="Project ID"),
     artifact_type: str = Query(
         ..., description="Artifact type (videos, frames, transcripts, notes)"
@@ -86,13 +111,22 @@ async def download_file(
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Check if file exists
-    if not storage.file_exists(username, project_id, artifact_type, filename):
+    if not await asyncio.to_thread(
+        storage.file_exists, username, project_id, artifact_type, filename
+    ):
         raise HTTPException(status_code=404, detail="File not found")
 
     try:
         # Download file from MinIO
-        file_bytes = storage.download_file(
-            username, project_id, artifact_type, filename
+        # Gzip-stored text is passed through as-is when the client accepts it
+        accepts_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+        file_bytes, encoding = await asyncio.to_thread(
+            storage.download_file_encoded,
+            username,
+            project_id,
+            artifact_type,
+            filename,
+            decompress=not accepts_gzip,
         )
 
         # Determine content type
@@ -112,14 +146,16 @@ async def download_file(
         elif filename.endswith(".png"):
             content_type = "image/png"
 
+        headers = {
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(len(file_bytes)),
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
         # Stream the file
         return StreamingResponse(
-            io.BytesIO(file_bytes),
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"',
-                "Content-Length": str(len(file_bytes)),
-            },
+            io.BytesIO(file_bytes), media_type=content_type, headers=headers
         )
 
     except Exception as e:
@@ -150,7 +186,9 @@ async def list_project_files(
                 status_code=400,
                 detail=f"Invalid artifact_type. Must be one of: {VALID_ARTIFACT_TYPES}",
             )
-        files = storage.list_files(username, project_id, artifact_type)
+        files = await asyncio.to_thread(
+            storage.list_files, username, project_id, artifact_type
+        )
         return {
             "project_id": project_id,
             "artifact_type": artifact_type,
@@ -158,9 +196,12 @@ async def list_project_files(
         }
 
     # List all artifact types
-    result = {"project_id": project_id, "files": {}}
-    for at in VALID_ARTIFACT_TYPES:
-        result["files"][at] = storage.list_files(username, project_id, at)
+    result = {
+        "project_id": project_id,
+        "files": await asyncio.to_thread(
+            storage.list_all_files, username, project_id, VALID_ARTIFACT_TYPES
+        ),
+    }
 
     return result
 
@@ -221,7 +262,8 @@ async def download_video(
             from pathlib import Path
 
             p = Path(file_path)
-            key = storage.upload_file_from_path(
+            key = await asyncio.to_thread(
+                storage.upload_file_from_path,
                 username,
                 req.video_id,
                 ARTIFACT_VIDEOS,
@@ -305,11 +347,15 @@ async def download_video_stream(
 
     asyncio.create_task(run_download())
 
-    async def event_generator() -> AsyncGenerator[str, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         while True:
             payload = await queue.get()
             if payload is None:
                 break
-            yield f"event: progress\ndata: {json.dumps(payload)}\n\n"
+            if orjson is not None:
+                data = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(payload).encode("utf-8")
+            yield b"event: progress\ndata: " + data + b"\n\n"
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
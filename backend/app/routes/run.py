@@ -7,7 +7,7 @@ All endpoints require authentication.
 import asyncio
 import json
 import uuid
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
@@ -25,6 +25,12 @@ from app.services.database.project_database import (
 )
 from app.utils import create_simple_logger
 
+try:
+    # Serializes straight to bytes and much faster than json + jsonable_encoder
+    import orjson
+except ImportError:
+    orjson = None
+
 router = APIRouter(prefix="/run", tags=["run"])
 logger = create_simple_logger(__name__)
 
@@ -55,10 +61,94 @@ class RunRequest(BaseModel):
     stream_config: Optional[StreamConfigModel] = None
 
 
-def _to_sse(event: Dict[str, Any]) -> str:
-    """Format a dict as Server-Sent Event message."""
-    payload = jsonable_encoder(event)
-    return f"event: progress\n" f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+# Upper bound on queued SSE messages merged into one response chunk
+SSE_MAX_BATCH = 64
+# Queued SSE messages allowed before the graph waits for a slow client
+SSE_QUEUE_SIZE = 64
+# Within one phase, forward at most one progress event per interval
+SSE_MIN_INTERVAL = 0.1
+TERMINAL_PHASES = {"done", "error", "cancelled"}
+
+
+def _to_sse(event: Dict[str, Any]) -> bytes:
+    """Format a dict as a pre-encoded Server-Sent Event message."""
+    if orjson is not None:
+        # jsonable_encoder only runs for values orjson can't serialize natively
+        data = orjson.dumps(
+            event,
+            default=jsonable_encoder,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    else:
+        payload = jsonable_encoder(event)
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return b"event: progress\ndata: " + data + b"\n\n"
+
+
+async def _throttle_events(
+    events: AsyncIterator[Dict[str, Any]], min_interval: float = SSE_MIN_INTERVAL
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Collapse bursts of same-phase events from stream_run_graph.
+
+    Every event carries the full state, so only the latest one in a burst is
+    needed. Events from the "updates" stream mode also carry a per-step delta
+    in ``stream.update`` and are never dropped. Phase changes and terminal
+    events pass through immediately, and a held-back event is flushed once the
+    interval elapses even if the graph is idle (e.g. waiting on an LLM call).
+    """
+    loop = asyncio.get_running_loop()
+    iterator = events.__aiter__()
+    pending: Optional[Dict[str, Any]] = None
+    last_phase: Optional[str] = None
+    last_sent = float("-inf")
+    next_event: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(iterator.__anext__())
+            timeout = None
+            if pending is not None:
+                timeout = max(0.0, last_sent + min_interval - loop.time())
+            done, _ = await asyncio.wait({next_event}, timeout=timeout)
+
+            if not done:
+                last_sent = loop.time()
+                event, pending = pending, None
+                yield event
+                continue
+
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                if next_event.done():
+                    next_event = None
+
+            phase = event.get("phase")
+            if (
+                phase != last_phase
+                or phase in TERMINAL_PHASES
+                or (event.get("stream") or {}).get("mode") == "updates"
+                or loop.time() - last_sent >= min_interval
+            ):
+                last_phase = phase
+                last_sent = loop.time()
+                pending = None
+                yield event
+            else:
+                pending = event
+
+        if pending is not None:
+            yield pending
+    finally:
+        if next_event is not None:
+            # Let the graph stream observe the cancellation before closing it
+            next_event.cancel()
+            await asyncio.gather(next_event, return_exceptions=True)
+        await iterator.aclose()
 
 
 def _ensure_pdf_fields(sc: Dict[str, Any]) -> Dict[str, Any]:
@@ -105,9 +195,9 @@ async def run_stream(
         logger.error(f"Failed to create run: {e}")
         raise HTTPException(status_code=500, detail="Failed to start pipeline run")
 
-    async def gen() -> AsyncGenerator[str, None]:
+    async def gen() -> AsyncGenerator[bytes, None]:
         cancel_event = asyncio.Event()
-        queue: "asyncio.Queue[str | None]" = asyncio.Queue()
+        queue: "asyncio.Queue[bytes | None]" = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
 
         # Build stream config once
         sc = (
@@ -117,7 +207,8 @@ async def run_stream(
         )
 
         async def _producer() -> None:
-            """Produce SSE strings onto the queue from the graph stream."""
+            """Produce encoded SSE messages onto the queue from the graph stream."""
+            cancelled = False
             try:
                 logger.info(
                     f"SSE producer started for user '{username}', project '{req.project_id}', run '{run_id}'"
@@ -126,7 +217,7 @@ async def run_stream(
                 # Update run status
                 update_run_status(username, req.project_id, run_id, "processing")
 
-                async for event in stream_run_graph(
+                events = stream_run_graph(
                     video_id=req.project_id,
                     username=username,  # Pass username for storage access
                     run_id=run_id,  # Pass run_id for notes versioning
@@ -140,7 +231,8 @@ async def run_stream(
                     stream_config=sc,
                     cancel_event=cancel_event,
                     refresh_notes=req.refresh_notes,
-                ):
+                )
+                async for event in _throttle_events(events):
                     await queue.put(_to_sse(event))
 
                     # Check for completion
@@ -151,6 +243,7 @@ async def run_stream(
 
             except asyncio.CancelledError:
                 logger.info("SSE producer cancelled")
+                cancelled = True
                 update_run_status(username, req.project_id, run_id, "failed")
                 return
             except Exception as exc:
@@ -168,7 +261,11 @@ async def run_stream(
                 )
             finally:
                 logger.info("SSE producer finishing")
-                await queue.put(None)
+                if not cancelled:
+                    await queue.put(None)
+                elif not queue.full():
+                    # The reader may already be gone, so never wait on it here
+                    queue.put_nowait(None)
 
         async def _watch_client_disconnect(task: asyncio.Task) -> None:
             """Monitor client connection; cancel producer immediately on disconnect."""
@@ -189,12 +286,22 @@ async def run_stream(
         )
 
         try:
-            yield ": connected\n\n"
-            while True:
-                item = await queue.get()
-                if item is None:
-                    break
-                yield item
+            yield b": connected\n\n"
+            done = False
+            while not done:
+                # Coalesce events that queued up during a burst into one write;
+                # nothing is held back waiting for more, so latency is unchanged
+                batch = [await queue.get()]
+                while batch[-1] is not None and len(batch) < SSE_MAX_BATCH:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                if batch[-1] is None:
+                    batch.pop()
+                    done = True
+                if batch:
+                    yield b"".join(batch)
         finally:
             watcher_task.cancel()
             producer_task.cancel()
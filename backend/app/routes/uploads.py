@@ -4,9 +4,10 @@ Provides endpoints for uploading videos, transcripts, and managing projects.
 All endpoints require authentication.
 """
 
+import asyncio
 import json
 import uuid
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from pydantic import BaseModel
@@ -33,6 +34,11 @@ from app.services.transcript_conversion import (
     srt_to_youtube_json,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 router = APIRouter(prefix="/uploads", tags=["uploads"])
 logger = create_simple_logger(__name__)
 
@@ -85,6 +91,13 @@ def _generate_project_id(prefix: str = "proj") -> str:
     return f"{prefix}_{uuid.uuid4().hex[:12]}"
 
 
+def _dump_transcript(transcript_data: list) -> Union[bytes, str]:
+    """Serialize transcript entries as indented JSON for storage."""
+    if orjson is not None:
+        return orjson.dumps(transcript_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(transcript_data, ensure_ascii=False, indent=2)
+
+
 async def _read_and_convert_transcript(transcript: UploadFile) -> list:
     """Read and convert transcript to YouTube JSON format."""
     content = await transcript.read()
@@ -150,16 +163,22 @@ async def upload_video_and_transcript(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-        # Upload video to MinIO
-        video_content = await video.read()
+        # Stream the spooled upload to MinIO instead of reading it into memory
         video_filename = video.filename or "video.mp4"
-        storage.upload_video(
-            username, project_id, video_content, filename=video_filename
+        await video.seek(0)
+        await asyncio.to_thread(
+            storage.upload_video_stream,
+            username,
+            project_id,
+            video.file,
+            filename=video_filename,
         )
 
         # Upload transcript to MinIO
-        transcript_json = json.dumps(transcript_data, ensure_ascii=False, indent=2)
-        storage.upload_transcript(username, project_id, transcript_json)
+        transcript_json = _dump_transcript(transcript_data)
+        await asyncio.to_thread(
+            storage.upload_transcript, username, project_id, transcript_json
+        )
 
         # Create project in MongoDB
         create_project(
@@ -219,8 +238,10 @@ async def upload_transcript_only(
             raise HTTPException(status_code=400, detail=str(e))
 
         # Upload transcript to MinIO
-        transcript_json = json.dumps(transcript_data, ensure_ascii=False, indent=2)
-        storage.upload_transcript(username, project_id, transcript_json)
+        transcript_json = _dump_transcript(transcript_data)
+        await asyncio.to_thread(
+            storage.upload_transcript, username, project_id, transcript_json
+        )
 
         # Create project in MongoDB
         create_project(
@@ -271,8 +292,8 @@ async def check_project(
 
     # Get notes files status from storage using the current run_id
     current_run_id = project.get("current_run_id")
-    notes_status = storage.get_notes_files_status(
-        username, project_id, run_id=current_run_id
+    notes_status = await asyncio.to_thread(
+        storage.get_notes_files_status, username, project_id, run_id=current_run_id
     )
 
     return {
@@ -342,7 +363,9 @@ async def delete_videos(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    count = storage.delete_artifact_type(username, project_id, ARTIFACT_VIDEOS)
+    count = await asyncio.to_thread(
+        storage.delete_artifact_type, username, project_id, ARTIFACT_VIDEOS
+    )
     update_project(username, project_id, {"has_video": False})
 
     return DeleteResponse(
@@ -366,7 +389,9 @@ async def delete_frames(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    count = storage.delete_artifact_type(username, project_id, ARTIFACT_FRAMES)
+    count = await asyncio.to_thread(
+        storage.delete_artifact_type, username, project_id, ARTIFACT_FRAMES
+    )
 
     return DeleteResponse(
         status="success",
@@ -389,8 +414,14 @@ async def delete_storage(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    videos_count = storage.delete_artifact_type(username, project_id, ARTIFACT_VIDEOS)
-    frames_count = storage.delete_artifact_type(username, project_id, ARTIFACT_FRAMES)
+    counts = await asyncio.to_thread(
+        storage.delete_artifact_types,
+        username,
+        project_id,
+        [ARTIFACT_VIDEOS, ARTIFACT_FRAMES],
+    )
+    videos_count = counts[ARTIFACT_VIDEOS]
+    frames_count = counts[ARTIFACT_FRAMES]
     update_project(username, project_id, {"has_video": False})
 
     return DeleteResponse(
@@ -415,7 +446,9 @@ async def delete_project_completely(
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Delete all files from MinIO
-    count = storage.delete_project_artifacts(username, project_id)
+    count = await asyncio.to_thread(
+        storage.delete_project_artifacts, username, project_id
+    )
 
     # Delete from MongoDB
     delete_project_db(username, project_id)
@@ -453,12 +486,11 @@ async def get_project_stats(
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Get size information from storage service
-    video_size = storage.get_artifact_size(username, project_id, ARTIFACT_VIDEOS)
-    frames_size = storage.get_artifact_size(username, project_id, ARTIFACT_FRAMES)
-    transcript_size = storage.get_artifact_size(
-        username, project_id, ARTIFACT_TRANSCRIPTS
-    )
-    notes_size = storage.get_artifact_size(username, project_id, ARTIFACT_NOTES)
+    sizes = await asyncio.to_thread(storage.get_artifact_sizes, username, project_id)
+    video_size = sizes[ARTIFACT_VIDEOS]
+    frames_size = sizes[ARTIFACT_FRAMES]
+    transcript_size = sizes[ARTIFACT_TRANSCRIPTS]
+    notes_size = sizes[ARTIFACT_NOTES]
 
     total_size = video_size + frames_size + transcript_size + notes_size
 
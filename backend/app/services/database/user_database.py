@@ -45,6 +45,8 @@ def get_auth_db_connection(mongo_uri: str = MONGO_URI):
 
         # Create unique index on username if it doesn't exist
         db[USERS_COLLECTION].create_index([("username", ASCENDING)], unique=True)
+        # Role lookups (e.g. admin checks at startup) shouldn't scan the collection
+        db[USERS_COLLECTION].create_index([("role", ASCENDING)])
 
         return client, db
     except Exception as e:
@@ -249,6 +251,22 @@ def list_all_users() -> list:
         return []
 
 
+def list_admin_usernames() -> list:
+    """
+    Get usernames of all admin users.
+    Uses an indexed role query instead of loading every user.
+    """
+    try:
+        _, db = get_auth_db_connection()
+        admins = db[USERS_COLLECTION].find(
+            {"role": ROLE_ADMIN}, {"_id": 0, "username": 1}
+        )
+        return [u["username"] for u in admins]
+    except Exception as e:
+        logger.error(f"Error listing admin users: {e}")
+        return []
+
+
 def user_exists(username: str) -> bool:
     """Check if a user exists in the database"""
     try:
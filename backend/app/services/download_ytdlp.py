@@ -1,5 +1,10 @@
+import errno
 import os
-from typing import Any, Callable, Dict, Optional
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
 
 import yt_dlp
 
@@ -14,6 +19,133 @@ downloads_dir = os.path.join(backend_dir, "outputs", "videos")
 os.makedirs(downloads_dir, exist_ok=True)
 logger.debug(f"Video downloads directory set at: {downloads_dir}")
 
+DEFAULT_FILENAME_TEMPLATE = "%(title)s.%(ext)s"
+
+# yt_dlp reports progress for every received block; forward at most one
+# "downloading" event per interval (the latest one wins)
+PROGRESS_MIN_INTERVAL = 0.1
+
+
+@dataclass(slots=True)
+class DownloadResult:
+    """Outcome of a download_media call.
+
+    ``output_dir`` is kept as given and only made absolute in ``to_dict``.
+    """
+
+    status: str
+    url: Optional[str]
+    output_dir: str
+    audio_only: bool
+    video_only: bool
+    resolution: Optional[int]
+    downloaded_files: List[str] = field(default_factory=list)
+    titles: Optional[List[str]] = None
+    count: Optional[int] = None
+    error: Optional[str] = None
+
+    def update(self, payload: Dict[str, Any]) -> None:
+        """Set fields from a progress payload dictionary."""
+        for key, value in payload.items():
+            setattr(self, key, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the dictionary returned by download_media."""
+        data: Dict[str, Any] = {
+            "status": self.status,
+            "url": self.url,
+            "output_dir": os.path.abspath(self.output_dir),
+            "audio_only": self.audio_only,
+            "video_only": self.video_only,
+            "resolution": self.resolution,
+            "downloaded_files": self.downloaded_files,
+        }
+        for key in ("titles", "count", "error"):
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        return data
+
+
+def _downloading_payload(d: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the payload sent to callbacks from a yt_dlp "downloading" event."""
+    return {
+        "status": "downloading",
+        "filename": d.get("filename"),
+        "downloaded_bytes": d.get("downloaded_bytes"),
+        "total_bytes": d.get("total_bytes") or d.get("total_bytes_estimate"),
+        "speed": d.get("speed"),
+        "elapsed": d.get("elapsed"),
+        "eta": d.get("eta"),
+        "fragment_index": d.get("fragment_index"),
+        "fragment_count": d.get("fragment_count"),
+    }
+
+
+def _link_or_copy(src: str, dst_dir: str) -> str:
+    """Place ``src`` inside ``dst_dir`` via a hardlink, copying across filesystems.
+
+    Returns the path of the file inside ``dst_dir``.
+    """
+    os.makedirs(dst_dir, exist_ok=True)
+    dst = os.path.join(dst_dir, os.path.basename(src))
+    if os.path.exists(dst):
+        return dst
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Different filesystem; shutil.copyfile uses sendfile where available
+        shutil.copyfile(src, dst)
+    return dst
+
+
+# Encoder arguments per target audio format; formats not listed use ffmpeg's default
+_AUDIO_ENCODER_ARGS: Dict[str, List[str]] = {
+    "mp3": ["-c:a", "libmp3lame", "-q:a", "0"],
+}
+
+
+def _convert_audio(src: str, audio_format: str, source_codec: Optional[str]) -> str:
+    """Convert a downloaded audio stream to ``audio_format`` with ffmpeg.
+
+    ``-threads 0`` lets ffmpeg use every core, and streams already encoded in the
+    target codec are remuxed with ``-c:a copy``. The source file is removed once
+    the conversion succeeds. Returns the path of the converted file.
+    """
+    base, ext = os.path.splitext(src)
+    if ext.lstrip(".").lower() == audio_format:
+        return src
+    dst = f"{base}.{audio_format}"
+
+    if source_codec and source_codec.lower().startswith(audio_format):
+        codec_args = ["-c:a", "copy"]
+    else:
+        codec_args = _AUDIO_ENCODER_ARGS.get(audio_format, [])
+
+    cmd = ["ffmpeg", "-y", "-loglevel", "error", "-threads", "0", "-i", src, "-vn"]
+    subprocess.run([*cmd, *codec_args, dst], check=True, capture_output=True)
+    os.remove(src)
+    return dst
+
+
+def _download_from_probe(
+    ydl: yt_dlp.YoutubeDL, url: str, info_probe: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Download using an already-extracted info dict instead of extracting again.
+
+    Falls back to a full ``extract_info(url, download=True)`` if yt_dlp cannot
+    process the probed result (e.g. expired format URLs). Download failures are
+    surfaced as ``DownloadError`` via ``report_error``, so both are caught, as in
+    yt_dlp's own ``download_with_info_file``.
+    """
+    try:
+        return ydl.process_ie_result(info_probe, download=True)
+    except (yt_dlp.utils.ExtractorError, yt_dlp.utils.DownloadError):
+        logger.warning("Could not reuse probed info for %s; extracting again", url)
+        return ydl.extract_info(url, download=True)
+
 
 def _video_format_for_resolution(resolution: Optional[int]) -> str:
     """Build a yt_dlp format selector that prefers MP4/M4A and caps height.
@@ -43,10 +175,13 @@ def download_media(
     video_only: bool = False,
     audio_format: str = "mp3",
     output_dir: str = downloads_dir,
-    filename_template: str = "%(title)s.%(ext)s",
+    filename_template: Optional[str] = None,
+    use_id_filenames: bool = False,
     verbose: bool = False,
     overwrite: bool = False,
     progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    info_dict: Optional[Dict[str, Any]] = None,
+    link_to: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Download a YouTube video or extract audio using yt_dlp.
 
@@ -65,12 +200,26 @@ def download_media(
         The audio format to convert to if audio_only is True. Default is 'mp3'.
     output_dir : str, optional
         The directory where downloaded files will be saved. Default is 'outputs/videos' in the backend directory.
-    filename_template : str, optional
-        The template for naming downloaded files. Default is '%(title)s.%(ext)s'.
+    filename_template : Optional[str], optional
+        The template for naming downloaded files. Takes precedence over
+        use_id_filenames when given. Default is '%(title)s.%(ext)s'.
+    use_id_filenames : bool, optional
+        If True and no filename_template is given, files are named after the
+        (ASCII-safe) video ID, which lets the expected output paths be computed
+        without asking yt_dlp to sanitize titles. Default is False.
     verbose : bool, optional
         If True, yt_dlp will output more detailed logs. Default is False.
     overwrite : bool, optional
         If True, existing files in the output directory may be overwritten. Default is False.
+    progress_callback : Optional[Callable[[Dict[str, Any]], None]], optional
+        Called with a progress dictionary for each yt_dlp progress event.
+    info_dict : Optional[Dict[str, Any]], optional
+        An info dictionary already returned by ``extract_info(url, download=False)``.
+        When provided, the metadata probe is skipped. Default is None.
+    link_to : Optional[str], optional
+        For uploaded videos only: a directory the cached files should also be
+        available in. Files are hardlinked (or copied across filesystems) and the
+        returned paths point to this directory. Default is None.
 
     Returns
     -------
@@ -113,19 +262,21 @@ def download_media(
                     f"Found {len(video_files)} cached video file(s) for uploaded video {video_id}. "
                     "Skipping download."
                 )
+                if link_to:
+                    video_files = [_link_or_copy(f, link_to) for f in video_files]
 
                 # Return success with cached files
-                payload = {
-                    "status": "skipped",
-                    "titles": ["Uploaded Video"],
-                    "count": len(video_files),
-                    "downloaded_files": video_files,
-                    "output_dir": os.path.abspath(output_dir),
-                    "audio_only": audio_only,
-                    "video_only": video_only,
-                    "resolution": resolution,
-                    "url": None,  # No URL for uploaded videos
-                }
+                payload = DownloadResult(
+                    status="skipped",
+                    titles=["Uploaded Video"],
+                    count=len(video_files),
+                    downloaded_files=video_files,
+                    output_dir=output_dir,
+                    audio_only=audio_only,
+                    video_only=video_only,
+                    resolution=resolution,
+                    url=None,  # No URL for uploaded videos
+                ).to_dict()
                 _emit(payload)
                 return payload
 
@@ -134,17 +285,18 @@ def download_media(
             f"No cached video files found for uploaded video ID: {video_id} at {output_dir}. "
             "Please upload the video first using the /uploads/video-and-transcript endpoint."
         )
-        return {
-            "status": "error",
-            "error": f"No cached video found for upload ID: {video_id}. Please upload the video first.",
-            "output_dir": os.path.abspath(output_dir),
-            "audio_only": audio_only,
-            "video_only": video_only,
-            "resolution": resolution,
-            "downloaded_files": [],
-        }
-
-    if os.path.exists(output_dir):
+        return DownloadResult(
+            status="error",
+            error=f"No cached video found for upload ID: {video_id}. Please upload the video first.",
+            url=None,
+            output_dir=output_dir,
+            audio_only=audio_only,
+            video_only=video_only,
+            resolution=resolution,
+        ).to_dict()
+
+    # The directory listing only feeds a log line, so skip it unless asked for
+    if verbose and os.path.exists(output_dir):
         files_in_dir = os.listdir(output_dir)
         if files_in_dir:
             logger.info(
@@ -154,46 +306,41 @@ def download_media(
     os.makedirs(output_dir, exist_ok=True)
     url = f"https://www.youtube.com/watch?v={video_id}"
 
+    # An explicit template always wins over ID-based naming
+    use_id_filenames = use_id_filenames and filename_template is None
+    if not use_id_filenames:
+        filename_template = filename_template or DEFAULT_FILENAME_TEMPLATE
+
     ydl_opts: Dict[str, Any] = {
         # Put all files under the provided output_dir regardless of playlist or single
         "paths": {"home": output_dir},
-        "outtmpl": filename_template,
-        "restrictfilenames": True,
+        "outtmpl": "%(id)s.%(ext)s" if use_id_filenames else filename_template,
         "noprogress": False,
         "quiet": not verbose,
         "merge_output_format": "mp4",  # when merging video+audio
     }
+    if not use_id_filenames:
+        ydl_opts["restrictfilenames"] = True
 
     if audio_only and video_only:
         raise ValueError("audio_only and video_only cannot both be True")
 
     if audio_only:
-        ydl_opts.update(
-            {
-                "format": "bestaudio/best",
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": audio_format,
-                        "preferredquality": "0",
-                    }
-                ],
-            }
-        )
+        # Conversion to audio_format is done by _convert_audio after the download
+        ydl_opts.update({"format": "bestaudio/best"})
     elif video_only:
         ydl_opts.update({"format": _video_only_format_for_resolution(resolution)})
     else:
         ydl_opts.update({"format": _video_format_for_resolution(resolution)})
 
-    result: Dict[str, Any] = {
-        "status": "unknown",
-        "url": url,
-        "output_dir": os.path.abspath(output_dir),
-        "audio_only": audio_only,
-        "video_only": video_only,
-        "resolution": resolution,
-        "downloaded_files": [],
-    }
+    result = DownloadResult(
+        status="unknown",
+        url=url,
+        output_dir=output_dir,
+        audio_only=audio_only,
+        video_only=video_only,
+        resolution=resolution,
+    )
 
     def _emit(progress: Dict[str, Any]) -> None:
         if progress_callback:
@@ -202,11 +349,22 @@ def download_media(
             except Exception:  # pylint: disable=broad-except
                 logger.exception("Progress callback raised an exception")
 
+    source_codecs: Dict[str, Optional[str]] = {}
+    # Latest "downloading" event not yet forwarded, and when one last was
+    pending_progress: Optional[Dict[str, Any]] = None
+    last_progress = float("-inf")
+
     def _hook(d: Dict[str, Any]):
-        if d.get("status") == "finished":
+        nonlocal pending_progress, last_progress
+        status = d.get("status")
+        if status == "finished":
             filename = d.get("filename")
-            if filename and filename not in result["downloaded_files"]:
-                result["downloaded_files"].append(filename)
+            if filename and filename not in result.downloaded_files:
+                result.downloaded_files.append(filename)
+                source_codecs[filename] = (d.get("info_dict") or {}).get("acodec")
+            if pending_progress is not None:
+                _emit(_downloading_payload(pending_progress))
+                pending_progress = None
             _emit(
                 {
                     "status": "finished",
@@ -216,27 +374,25 @@ def download_media(
                     or d.get("total_bytes_estimate"),
                 }
             )
-        elif d.get("status") == "downloading":
-            _emit(
-                {
-                    "status": "downloading",
-                    "filename": d.get("filename"),
-                    "downloaded_bytes": d.get("downloaded_bytes"),
-                    "total_bytes": d.get("total_bytes")
-                    or d.get("total_bytes_estimate"),
-                    "speed": d.get("speed"),
-                    "elapsed": d.get("elapsed"),
-                    "eta": d.get("eta"),
-                    "fragment_index": d.get("fragment_index"),
-                    "fragment_count": d.get("fragment_count"),
-                }
-            )
+        elif status == "downloading" and progress_callback:
+            now = time.monotonic()
+            if now - last_progress >= PROGRESS_MIN_INTERVAL:
+                last_progress = now
+                pending_progress = None
+                _emit(_downloading_payload(d))
+            else:
+                # Keep only a reference; the payload is built if it is ever sent
+                pending_progress = d
 
     ydl_opts.setdefault("progress_hooks", []).append(_hook)
 
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info_probe = ydl.extract_info(url, download=False)
+            info_probe = (
+                info_dict
+                if info_dict is not None
+                else ydl.extract_info(url, download=False)
+            )
             if "entries" in info_probe and isinstance(info_probe["entries"], list):
                 entries_probe = [e for e in info_probe["entries"] if e]
             else:
@@ -246,6 +402,19 @@ def download_media(
             expected_files = []
             titles = []
             for e in entries_probe:
+                titles.append(str(e.get("title")))
+                if use_id_filenames:
+                    if audio_only:
+                        ext = audio_format
+                    elif video_only:
+                        ext = e.get("ext") or "mp4"
+                    else:
+                        ext = ydl_opts["merge_output_format"]
+                    expected_files.append(
+                        os.path.join(output_dir, f"{e.get('id', video_id)}.{ext}")
+                    )
+                    continue
+
                 try:
                     raw_path = ydl.prepare_filename(e)
                 except Exception:
@@ -264,7 +433,6 @@ def download_media(
                     final_ext = ydl_opts.get("merge_output_format", "mp4")
                     expected = f"{base}.{final_ext}"
                 expected_files.append(expected)
-                titles.append(str(e.get("title")))
 
             if (
                 not overwrite
@@ -282,9 +450,14 @@ def download_media(
                 }
                 result.update(payload)
                 _emit(payload)
-                return result
-
-            info = ydl.extract_info(url, download=True)
+                return result.to_dict()
+
+            info = _download_from_probe(ydl, url, info_probe)
+            if audio_only:
+                result.downloaded_files = [
+                    _convert_audio(f, audio_format, source_codecs.get(f))
+                    for f in result.downloaded_files
+                ]
             # Normalize playlist vs single
             if "entries" in info and isinstance(info["entries"], list):
                 entries = [e for e in info["entries"] if e]
@@ -297,7 +470,7 @@ def download_media(
                 "status": "success",
                 "titles": titles,
                 "count": len(entries),
-                "downloaded_files": result["downloaded_files"],
+                "downloaded_files": result.downloaded_files,
             }
             result.update(payload)
             _emit(payload)
@@ -310,11 +483,14 @@ def download_media(
         result.update(error_payload)
         _emit(error_payload)
 
-    return result
+    return result.to_dict()
 
 
 def download_thumbnail(
-    video_id: str, output_dir: str = downloads_dir, verbose: bool = False
+    video_id: str,
+    output_dir: str = downloads_dir,
+    verbose: bool = False,
+    info_dict: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Download the thumbnail of a YouTube video using yt_dlp.
 
@@ -326,6 +502,9 @@ def download_thumbnail(
         The directory where the downloaded thumbnail will be saved. Default is 'outputs/videos' in the backend directory.
     verbose : bool, optional
         If True, yt_dlp will output more detailed logs. Default is False.
+    info_dict : Optional[Dict[str, Any]], optional
+        An info dictionary already returned by ``extract_info(url, download=False)``.
+        When provided, the metadata probe is skipped. Default is None.
 
     Returns
     -------
@@ -340,7 +519,8 @@ def download_thumbnail(
     if not output_dir.endswith(video_id):
         output_dir = os.path.join(output_dir, video_id)
 
-    if os.path.exists(output_dir):
+    # The directory listing only feeds a log line, so skip it unless asked for
+    if verbose and os.path.exists(output_dir):
         files_in_dir = os.listdir(output_dir)
         if files_in_dir:
             logger.info(
@@ -383,7 +563,11 @@ def download_thumbnail(
 
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info_probe = ydl.extract_info(url, download=False)
+            info_probe = (
+                info_dict
+                if info_dict is not None
+                else ydl.extract_info(url, download=False)
+            )
             title = str(info_probe.get("title", "unknown_title"))
 
             # Compute expected thumbnail filename using the same template and options
@@ -407,7 +591,7 @@ def download_thumbnail(
                     }
                 )
                 return result
-            info = ydl.extract_info(url, download=True)
+            info = _download_from_probe(ydl, url, info_probe)
             result.update(
                 {
                     "status": "success",
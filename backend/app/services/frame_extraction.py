@@ -1,7 +1,14 @@
+import asyncio
+import io
 import os
-from typing import Optional, Tuple
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 import ffmpeg
+import numpy as np
 from PIL import Image
 
 from app.utils import create_simple_logger
@@ -13,44 +20,119 @@ file_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.abspath(os.path.join(file_dir, "../.."))
 downloads_dir = os.path.join(backend_dir, "outputs", "frames")
 os.makedirs(downloads_dir, exist_ok=True)
-logger.debug(f"Image downloads directory set at: {downloads_dir}")
+logger.debug("Image downloads directory set at: %s", downloads_dir)
 
 DEFAULT_IMAGE_SHAPE = (720, 1280)  # 720p
+# Output options that make ffmpeg write a single JPEG to stdout
+PIPE_OUTPUT_OPTIONS = {"format": "image2", "vcodec": "mjpeg"}
+# extract_frames_batch decodes timestamps within this many seconds of a group's
+# first one in one ffmpeg run (about a keyframe interval); anything further is
+# cheaper to reach with its own seek than to decode through
+BATCH_MAX_SPAN = 4
+
+
+def _stat_key(video_path: str) -> Tuple[float, int]:
+    """Cache key that changes whenever the file at ``video_path`` is modified."""
+    stat = os.stat(video_path)
+    return stat.st_mtime, stat.st_size
 
 
 def _get_video_duration(video_path: str) -> float:
     """Get the duration of a video file in seconds."""
+    return _probe_duration(video_path, _stat_key(video_path))
+
+
+@lru_cache(maxsize=128)
+def _probe_duration(video_path: str, stat_key: Tuple[float, int]) -> float:
     try:
         probe = ffmpeg.probe(video_path)
         duration = float(probe["format"]["duration"])
-        logger.debug(f"Video duration of {video_path}: {duration} seconds")
+        logger.debug("Video duration of %s: %s seconds", video_path, duration)
         return duration
     except ffmpeg.Error as e:
         logger.error(f"Error getting video duration: {e.stderr.decode()}")
         raise RuntimeError(f"Could not get video duration for {video_path}") from e
 
 
+def _timestamp_to_seconds(timestamp: str) -> int:
+    """Convert a "HH:MM:SS" timestamp into a number of seconds."""
+    h, m, s = map(int, timestamp.split(":"))
+    return h * 3600 + m * 60 + s
+
+
+def _frame_filename(timestamp: str) -> str:
+    """Name of the image file a frame extracted at ``timestamp`` is saved to."""
+    return f"frame_at_{timestamp.replace(':', '-')}.jpg"
+
+
 def _raise_timestamp_if_exceeds_duration(timestamp: str, duration: float) -> None:
     """Raise an error if the given timestamp exceeds the video duration."""
-    h, m, s = map(int, timestamp.split(":"))
-    total_seconds = h * 3600 + m * 60 + s
+    total_seconds = _timestamp_to_seconds(timestamp)
     if total_seconds > duration:
         raise ValueError(
             f"Timestamp {timestamp} exceeds video duration of {duration} seconds."
         )
 
 
-def _extract_frame(video_path, timestamp, output_path, verbose=False):
-    """Extract a single frame from a video at a specific timestamp."""
+def _frame_stream(
+    video_path, timestamp, output_path, image_shape=None, exact=True, **output_options
+):
+    """Build the ffmpeg command that extracts a single frame at a timestamp.
+
+    ffmpeg seeks to the last keyframe before the timestamp and decodes forward to
+    the exact timestamp. With ``exact=False`` the decode-forward step is skipped
+    (``-noaccurate_seek``) and the keyframe itself is returned, which is faster on
+    sources with long keyframe intervals. When ``image_shape`` (height, width) is
+    given, ffmpeg scales the frame to it before encoding. Extra
+    ``output_options`` are passed to the ffmpeg output.
+    """
     duration = _get_video_duration(video_path)
     _raise_timestamp_if_exceeds_duration(timestamp, duration)
-    (
-        ffmpeg.input(video_path, ss=timestamp)
-        .output(output_path, vframes=1, loglevel="error")
-        .run(overwrite_output=True, quiet=not verbose)
+
+    input_kwargs = {"ss": _timestamp_to_seconds(timestamp)}
+    if not exact:
+        input_kwargs["noaccurate_seek"] = None
+    output_kwargs = {"vframes": 1, "loglevel": "error", **output_options}
+    if image_shape is not None:
+        output_kwargs["vf"] = f"scale={image_shape[1]}:{image_shape[0]}"
+    return ffmpeg.input(video_path, **input_kwargs).output(output_path, **output_kwargs)
+
+
+def extract_frame_bytes(
+    video_path: str,
+    timestamp: str,
+    image_shape: Optional[tuple[int, int]] = DEFAULT_IMAGE_SHAPE,
+    verbose: bool = False,
+    exact: bool = True,
+) -> bytes:
+    """Extract a frame as JPEG bytes piped from ffmpeg, without touching the disk.
+
+    Parameters
+    ----------
+    video_path : str
+        Path to the input video file.
+    timestamp : str
+        Timestamp in the format "HH:MM:SS" to extract the frame.
+    image_shape : Optional[tuple[int, int]], optional
+        Desired image shape as (height, width). None keeps the source resolution.
+    verbose : bool, optional
+        If True, ffmpeg's stderr is not captured. Default is False.
+    exact : bool, optional
+        If False, return the nearest preceding keyframe instead of the frame at
+        exactly the timestamp. Faster, but can be off by up to one keyframe
+        interval. Default is True.
+
+    Returns
+    -------
+    bytes
+        The encoded JPEG image.
+    """
+    stream = _frame_stream(
+        video_path, timestamp, "pipe:", image_shape, exact, **PIPE_OUTPUT_OPTIONS
     )
-    logger.debug(f"Frame extracted at {timestamp} and saved to {output_path}")
-    return output_path
+    jpeg_bytes, _ = stream.run(capture_stdout=True, capture_stderr=not verbose)
+    logger.debug("Frame extracted at %s (%s bytes)", timestamp, len(jpeg_bytes))
+    return jpeg_bytes
 
 
 def add_duration_to_timestamp(timestamp: str, quantity: int, unit: str) -> str:
@@ -87,10 +169,66 @@ def add_duration_to_timestamp(timestamp: str, quantity: int, unit: str) -> str:
     new_s = total_seconds % 60
 
     new_timestamp = f"{new_h:02}:{new_m:02}:{new_s:02}"
-    logger.debug(f"Timestamp {timestamp} + {quantity} {unit} = {new_timestamp}")
+    logger.debug("Timestamp %s + %s %s = %s", timestamp, quantity, unit, new_timestamp)
     return new_timestamp
 
 
+def add_duration_to_timestamps_batch(
+    timestamps: List[str], quantities, unit: str
+) -> List[str]:
+    """Add durations to many "HH:MM:SS" timestamps at once.
+
+    Vectorized counterpart of `add_duration_to_timestamp`: the timestamps are
+    parsed in one pass and the arithmetic is done on NumPy arrays.
+
+    Parameters
+    ----------
+    timestamps : List[str]
+        The original timestamps in "HH:MM:SS" format.
+    quantities : int or array-like of int
+        The quantity to add, either one for all timestamps or one per timestamp.
+    unit : str
+        The unit of the duration ('seconds', 'minutes', 'hours').
+
+    Returns
+    -------
+    List[str]
+        The new timestamps, in "HH:MM:SS" format and in the same order.
+    """
+    unit_seconds = {"seconds": 1, "minutes": 60, "hours": 3600}
+    if unit not in unit_seconds:
+        raise ValueError("Unit must be 'seconds', 'minutes', or 'hours'.")
+
+    if not timestamps:
+        return []
+    parts = np.array([ts.split(":") for ts in timestamps], dtype=np.int64)
+    if parts.shape != (len(timestamps), 3):
+        raise ValueError('Timestamps must be in "HH:MM:SS" format.')
+    totals = parts @ np.array([3600, 60, 1], dtype=np.int64)
+    totals += np.asarray(quantities, dtype=np.int64) * unit_seconds[unit]
+
+    hours, rest = np.divmod(totals, 3600)
+    minutes, seconds = np.divmod(rest, 60)
+    return [
+        f"{h:02}:{m:02}:{sec:02}"
+        for h, m, sec in zip(hours.tolist(), minutes.tolist(), seconds.tolist())
+    ]
+
+
+def _frame_output_path(
+    video_path: str, timestamp: str, output_dir: str, video_id: Optional[str]
+) -> str:
+    """Path a frame at ``timestamp`` is saved to, creating its directory if needed."""
+    if video_id is None:
+        video_id = video_path.split(os.path.sep)[-2]
+        logger.info(f"Video ID not provided. Derived ID from path as: {video_id}")
+
+    output_dir = os.path.join(output_dir, video_id)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, _frame_filename(timestamp))
+
+
 def extract_frame(
     video_path: str,
     timestamp: str,
@@ -98,6 +236,7 @@ def extract_frame(
     image_shape: tuple[int, int] = DEFAULT_IMAGE_SHAPE,
     video_id: Optional[str] = None,
     verbose: bool = False,
+    exact: bool = True,
 ) -> Tuple[str, Image.Image]:
     """Extract a frame from a video at a specific timestamp and save it as an image.
 
@@ -115,40 +254,294 @@ def extract_frame(
         Optional video ID to use in naming the output file. If None, derived from video_path.
     verbose : bool, optional
         If True, enables verbose logging. Default is False.
+    exact : bool, optional
+        If False, return the nearest preceding keyframe instead of the frame at
+        exactly the timestamp. Faster on sources with long keyframe intervals,
+        but can be off by up to one keyframe interval. Default is True.
 
     Returns
     -------
     Tuple[str, Image.Image]
         A tuple containing the path to the saved image and the PIL Image object.
     """
+    output_path = _frame_output_path(video_path, timestamp, output_dir, video_id)
+    if os.path.exists(output_path):
+        logger.info(f"Frame already exists at {output_path}. Skipping extraction.")
+        img = Image.open(output_path)
+        return output_path, img
+
+    # ffmpeg encodes the frame at image_shape and pipes it back, so the image is
+    # written once and opened from memory instead of being read back from disk
+    jpeg_bytes = extract_frame_bytes(
+        video_path, timestamp, image_shape=image_shape, verbose=verbose, exact=exact
+    )
+    Path(output_path).write_bytes(jpeg_bytes)
+    logger.debug("Frame saved to %s", output_path)
+    img = Image.open(io.BytesIO(jpeg_bytes))
+    return output_path, img
+
+
+async def aextract_frame(
+    video_path: str,
+    timestamp: str,
+    output_dir: str = downloads_dir,
+    image_shape: tuple[int, int] = DEFAULT_IMAGE_SHAPE,
+    video_id: Optional[str] = None,
+    verbose: bool = False,
+    exact: bool = True,
+) -> Tuple[str, Image.Image]:
+    """Async version of `extract_frame` that does not block the event loop.
+
+    ffmpeg runs through ``asyncio.create_subprocess_exec``. The (cached) probes and
+    PIL calls run in worker threads. Parameters and return value are the same as
+    for `extract_frame`.
+    """
+    output_path = _frame_output_path(video_path, timestamp, output_dir, video_id)
+    if os.path.exists(output_path):
+        logger.info(f"Frame already exists at {output_path}. Skipping extraction.")
+        img = await asyncio.to_thread(Image.open, output_path)
+        return output_path, img
+
+    jpeg_bytes = await _aextract_frame_bytes(
+        video_path, timestamp, image_shape, verbose=verbose, exact=exact
+    )
+    await asyncio.to_thread(Path(output_path).write_bytes, jpeg_bytes)
+    logger.debug("Frame saved to %s", output_path)
+    img = Image.open(io.BytesIO(jpeg_bytes))
+    return output_path, img
+
+
+async def _aextract_frame_bytes(
+    video_path: str,
+    timestamp: str,
+    image_shape: Optional[tuple[int, int]],
+    verbose: bool = False,
+    exact: bool = True,
+) -> bytes:
+    """Async version of `extract_frame_bytes` using ``create_subprocess_exec``."""
+    stream = await asyncio.to_thread(
+        _frame_stream,
+        video_path,
+        timestamp,
+        "pipe:",
+        image_shape,
+        exact,
+        **PIPE_OUTPUT_OPTIONS,
+    )
+    proc = await asyncio.create_subprocess_exec(
+        *stream.compile(),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=None if verbose else asyncio.subprocess.PIPE,
+    )
+    try:
+        jpeg_bytes, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        # Don't leave ffmpeg running when the caller stops waiting for it
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", jpeg_bytes, stderr)
+    logger.debug("Frame extracted at %s (%s bytes)", timestamp, len(jpeg_bytes))
+    return jpeg_bytes
+
+
+def _decode_jpeg(jpeg_bytes: bytes) -> Image.Image:
+    img = Image.open(io.BytesIO(jpeg_bytes))
+    img.load()
+    return img
+
+
+async def aextract_frames(
+    video_path: str,
+    timestamps: List[str],
+    image_shape: Optional[tuple[int, int]] = DEFAULT_IMAGE_SHAPE,
+    exact: bool = True,
+    prefetch: int = 4,
+) -> AsyncIterator[Tuple[str, Image.Image]]:
+    """Extract frames at many timestamps, decoding one while ffmpeg extracts the next.
+
+    A producer task runs ffmpeg for each timestamp and puts the JPEG bytes on a
+    bounded queue; the consumer decodes them in a worker thread. The queue size
+    (``prefetch``) bounds how many encoded frames are held in memory. Nothing is
+    written to disk. Timestamps that cannot be extracted are logged and skipped.
+
+    Yields
+    ------
+    Tuple[str, Image.Image]
+        The timestamp and its decoded frame, in the order of ``timestamps``.
+    """
+    queue: asyncio.Queue[Optional[Tuple[str, bytes]]] = asyncio.Queue(maxsize=prefetch)
+
+    async def produce() -> None:
+        for timestamp in timestamps:
+            try:
+                jpeg_bytes = await _aextract_frame_bytes(
+                    video_path, timestamp, image_shape, exact=exact
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Skipping frame at {timestamp}: {e}")
+                continue
+            await queue.put((timestamp, jpeg_bytes))
+        await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (item := await queue.get()) is not None:
+            timestamp, jpeg_bytes = item
+            yield timestamp, await asyncio.to_thread(_decode_jpeg, jpeg_bytes)
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def _group_timestamps(
+    seconds: List[Tuple[int, str]], max_span: int
+) -> List[List[Tuple[int, str]]]:
+    """Split sorted ``(seconds, timestamp)`` pairs into groups that each cover at
+    most ``max_span`` seconds from their first timestamp."""
+    groups: List[List[Tuple[int, str]]] = []
+    for item in seconds:
+        if groups and item[0] - groups[-1][0][0] <= max_span:
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    return groups
+
+
+def _extract_frame_group(
+    video_path: str,
+    group: List[Tuple[int, str]],
+    output_dir: str,
+    image_shape: tuple[int, int],
+    verbose: bool = False,
+) -> Dict[str, str]:
+    """Extract the frames for one group of timestamps with a single ffmpeg run.
+
+    The input is seeked to the earliest timestamp and decoded once up to the
+    latest. It is split into one branch per timestamp, and each branch keeps the
+    first frame at or after its timestamp. That is the same frame the
+    single-frame path picks. Selection is on presentation time, so
+    variable-frame-rate sources are handled correctly.
+    """
+    start = group[0][0]
+    height, width = image_shape
+    branches = ffmpeg.input(video_path, ss=start).video.split()
+    tmp_dir = tempfile.mkdtemp(prefix="batch_", dir=output_dir)
+    frame_paths: Dict[str, str] = {}
+    try:
+        outputs = [
+            branches[i]
+            .filter("select", f"gte(t,{seconds - start})")
+            .filter("scale", width, height)
+            .output(os.path.join(tmp_dir, f"{i}.jpg"), vframes=1, loglevel="error")
+            for i, (seconds, _) in enumerate(group)
+        ]
+        ffmpeg.merge_outputs(*outputs).run(overwrite_output=True, quiet=not verbose)
+        for i, (_, timestamp) in enumerate(group):
+            tmp_path = os.path.join(tmp_dir, f"{i}.jpg")
+            if not os.path.exists(tmp_path):
+                logger.warning(f"ffmpeg produced no frame for timestamp {timestamp}")
+                continue
+            output_path = os.path.join(output_dir, _frame_filename(timestamp))
+            os.replace(tmp_path, output_path)
+            frame_paths[timestamp] = output_path
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return frame_paths
+
+
+def extract_frames_batch(
+    video_path: str,
+    timestamps: List[str],
+    output_dir: str = downloads_dir,
+    image_shape: tuple[int, int] = DEFAULT_IMAGE_SHAPE,
+    video_id: Optional[str] = None,
+    verbose: bool = False,
+    max_span: int = BATCH_MAX_SPAN,
+) -> Dict[str, str]:
+    """Extract frames at several timestamps with as few ffmpeg invocations as possible.
+
+    Timestamps within ``max_span`` seconds of a group's earliest one are
+    extracted together: ffmpeg seeks to the earliest and decodes forward once,
+    instead of spawning one process per frame. Every group is capped at
+    ``max_span`` seconds, so a chain of nearby timestamps never decodes a long
+    stretch of video.
+
+    Parameters
+    ----------
+    video_path : str
+        Path to the input video file.
+    timestamps : List[str]
+        Timestamps in the format "HH:MM:SS" to extract frames at.
+    output_dir : str, optional
+        Directory under which the frames are saved, in a sub-directory per video.
+    image_shape : tuple[int, int], optional
+        Desired image shape as (height, width). Default is (720, 1280).
+    video_id : Optional[str], optional
+        Optional video ID to use in naming the output directory. If None, derived from video_path.
+    verbose : bool, optional
+        If True, enables verbose logging. Default is False.
+    max_span : int, optional
+        Longest stretch of video, in seconds, decoded in one ffmpeg run.
+
+    Returns
+    -------
+    Dict[str, str]
+        A mapping from each successfully extracted timestamp to its image path.
+        Timestamps beyond the video duration are skipped.
+    """
     if video_id is None:
         video_id = video_path.split(os.path.sep)[-2]
         logger.info(f"Video ID not provided. Derived ID from path as: {video_id}")
 
     output_dir = os.path.join(output_dir, video_id)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
 
-    output_path = os.path.join(
-        output_dir, f"frame_at_{timestamp.replace(':', '-')}.jpg"
-    )
-    if os.path.exists(output_path):
-        logger.info(f"Frame already exists at {output_path}. Skipping extraction.")
-        img = Image.open(output_path)
-        return output_path, img
+    frame_paths: Dict[str, str] = {}
+    pending: List[str] = []
+    for timestamp in dict.fromkeys(timestamps):
+        output_path = os.path.join(output_dir, _frame_filename(timestamp))
+        if os.path.exists(output_path):
+            frame_paths[timestamp] = output_path
+        else:
+            pending.append(timestamp)
 
-    _extract_frame(video_path, timestamp, output_path, verbose=verbose)
+    if not pending:
+        return frame_paths
 
-    img = Image.open(output_path)
-    if img.size != (image_shape[1], image_shape[0]):  # PIL uses (width, height)
-        img = img.resize((image_shape[1], image_shape[0]))
-        img.save(output_path)
-        logger.debug(f"Resized image to {image_shape} and saved to {output_path}")
-    else:
-        logger.debug(
-            f"Image size matches desired shape {image_shape}. No resize needed."
-        )
-    return output_path, img
+    duration = _get_video_duration(video_path)
+    targets: Dict[int, str] = {}
+    for timestamp in pending:
+        try:
+            _raise_timestamp_if_exceeds_duration(timestamp, duration)
+        except ValueError as e:
+            logger.warning(f"Skipping frame: {e}")
+            continue
+        targets.setdefault(_timestamp_to_seconds(timestamp), timestamp)
+
+    for group in _group_timestamps(sorted(targets.items()), max_span):
+        if len(group) == 1:
+            # A single frame is cheaper with the seek-based single-frame path
+            path, _ = extract_frame(
+                video_path,
+                group[0][1],
+                output_dir=os.path.dirname(output_dir),
+                image_shape=image_shape,
+                video_id=video_id,
+                verbose=verbose,
+            )
+            frame_paths[group[0][1]] = path
+        else:
+            frame_paths.update(
+                _extract_frame_group(
+                    video_path, group, output_dir, image_shape, verbose=verbose
+                )
+            )
+            logger.debug(
+                "Extracted %s frames from %s in one pass", len(group), video_path
+            )
+    return frame_paths
 
 
 # TODO: Check for duplicate frames
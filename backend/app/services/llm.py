@@ -1,13 +1,12 @@
-from langchain_litellm import ChatLiteLLM
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_nvidia_ai_endpoints import ChatNVIDIA
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage
-from typing import List, AsyncGenerator, Dict, Optional, Union, Literal
+from langchain_core.runnables import Runnable
+from typing import Any, List, AsyncGenerator, Dict, Optional, Literal
 from pydantic import BaseModel
+from functools import lru_cache
+import importlib
 import os
+import threading
 from dotenv import load_dotenv
 
 from app.utils import create_simple_logger
@@ -17,6 +16,18 @@ logger = create_simple_logger(__name__)
 
 LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash")
 
+# Provider integrations are imported on first use, so only the SDKs that are
+# actually configured get loaded at startup.
+CHAT_RUNNABLES: Dict[str, tuple] = {
+    "google": ("langchain_google_genai", "ChatGoogleGenerativeAI"),
+    "litellm": ("langchain_litellm", "ChatLiteLLM"),
+    "openai": ("langchain_openai", "ChatOpenAI"),
+    "openrouter": ("langchain_openai", "ChatOpenAI"),
+    "groq": ("langchain_groq", "ChatGroq"),
+    "ollama": ("langchain_ollama", "ChatOllama"),
+    "nvidia": ("langchain_nvidia_ai_endpoints", "ChatNVIDIA"),
+}
+
 __all__ = [
     "create_llm_instance",
     "atext_completion",
@@ -31,35 +42,85 @@ __all__ = [
 ]
 
 
+def _freeze(value: Any) -> Any:
+    """Convert ``value`` into a hashable equivalent for use in a cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class _LLMSpec:
+    """Arguments for building an LLM runnable, hashable so it can key a cache."""
+
+    __slots__ = ("provider", "response_format", "model", "kwargs", "_key")
+
+    def __init__(self, provider, response_format, model, kwargs: Dict) -> None:
+        self.provider = provider
+        self.response_format = response_format
+        self.model = model
+        self.kwargs = kwargs
+        self._key = (provider, _freeze(response_format), model, _freeze(kwargs))
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _LLMSpec) and self._key == other._key
+
+
+_llm_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=32)
+def _cached_llm_instance(spec: _LLMSpec):
+    return _build_llm_instance(
+        spec.provider, spec.response_format, spec.model, **spec.kwargs
+    )
+
+
 def create_llm_instance(
     provider=Literal["google", "litellm", "openai", "openrouter", "groq", "ollama"],
     response_format: Optional[BaseModel] = None,
     model=LLM_MODEL,
     **kwargs: Dict,
-) -> Union[ChatGoogleGenerativeAI, ChatLiteLLM, ChatOpenAI]:
-    """Create and return an instance of the specified LLM runnable using provider and kwargs."""
-    chat_runnable_mapping = {
-        "google": ChatGoogleGenerativeAI,
-        "litellm": ChatLiteLLM,
-        "openai": ChatOpenAI,
-        "openrouter": ChatOpenAI,
-        "groq": ChatGroq,
-        "ollama": ChatOllama,
-        "nvidia": ChatNVIDIA,
-    }
-
-    if provider not in chat_runnable_mapping:
+) -> Runnable:
+    """Create and return an instance of the specified LLM runnable using provider and kwargs.
+
+    Instances are cached per (provider, model, response_format, kwargs) so that
+    repeated calls reuse the provider client and its connection pool.
+    """
+    to_remove = ["stream", "max_retries", "model"]
+    kwargs = {k: v for k, v in kwargs.items() if k not in to_remove}
+    spec = _LLMSpec(provider, response_format, model, kwargs)
+    with _llm_cache_lock:
+        return _cached_llm_instance(spec)
+
+
+def _load_chat_runnable(provider: str) -> type[BaseChatModel]:
+    """Import and return the chat model class registered for ``provider``."""
+    if provider not in CHAT_RUNNABLES:
         raise ValueError(
-            f"Unsupported provider: {provider}. Must be one of {list(chat_runnable_mapping.keys())}."
+            f"Unsupported provider: {provider}. Must be one of {list(CHAT_RUNNABLES.keys())}."
         )
+    module_name, class_name = CHAT_RUNNABLES[provider]
+    return getattr(importlib.import_module(module_name), class_name)
 
-    chat_runnable = chat_runnable_mapping[provider]
-    logger.debug(f"Selected chat runnable: {chat_runnable.__name__}")
 
-    to_remove = ["stream", "max_retries", "model"]
-    for key in to_remove:
-        if key in kwargs:
-            kwargs.pop(key)
+def _build_llm_instance(
+    provider: str,
+    response_format: Optional[BaseModel],
+    model: str,
+    **kwargs: Dict,
+) -> Runnable:
+    """Construct a new LLM runnable for the given provider."""
+    chat_runnable = _load_chat_runnable(provider)
+    logger.debug("Selected chat runnable: %s", chat_runnable.__name__)
 
     if provider == "openrouter":
         # need to change API key and base URL for OpenRouter
@@ -130,9 +191,14 @@ async def atext_completion_stream(
     messages: List[BaseMessage],
     provider: Literal["google", "litellm", "openai", "openrouter"] = "google",
     response_format: Optional[BaseModel] = None,
+    as_json: bool = False,
     **kwargs: Dict,
 ) -> AsyncGenerator[str, None]:
-    """Async generator yielding incremental completion chunks without duplicates."""
+    """Async generator yielding incremental completion chunks.
+
+    With a ``response_format``, structured chunks are yielded as dicts, or as JSON
+    strings serialized by pydantic-core when ``as_json`` is True.
+    """
     if "stream" not in kwargs:
         kwargs["stream"] = True
     llm = create_llm_instance(
@@ -147,30 +213,21 @@ async def atext_completion_stream(
         logger.error(f"Error during async streaming completion: {e}")
         raise e
 
-    assembled = ""
+    # LangChain chat models stream deltas, so each chunk is new text
+    dump_method = "model_dump_json" if as_json else "model_dump"
     async for chunk in response_stream:
         if response_format:
             try:
-                assembled = chunk.model_dump()
-                yield assembled
+                yield getattr(chunk, dump_method)()
             except Exception as e:
                 logger.warning(f"Error during model_dump: {e}\nYielding raw chunk.")
                 yield str(chunk)
-        else:
-            if hasattr(chunk, "text"):
-                text_chunk = chunk.text()
-            else:
-                text_chunk = str(chunk)
-            # Yield only new text to avoid duplicates
-            if text_chunk.startswith(assembled):
-                new_text = text_chunk[len(assembled) :]
-                if new_text:
-                    yield new_text
-                    assembled += new_text
-            else:
-                # In case of unexpected change, yield the whole chunk
-                yield text_chunk
-                assembled = text_chunk
+            continue
+
+        # text() joins multi-part content; chunk.content may be a list of parts
+        text_chunk = chunk.text() if hasattr(chunk, "text") else str(chunk)
+        if text_chunk:
+            yield text_chunk
 
 
 async def acompletion_using_gemini(
@@ -1,16 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Union
+import asyncio
+import hashlib
+import json
 import os
 import platform
 import subprocess
+import uuid
 
-from .markdown_embedder import embed_images_reference_style
+from .markdown_embedder import (
+    embed_images_reference_style,
+    local_image_paths,
+    render_embedded_markdown,
+)
+from app.env import XELATEX_FORMAT
 from app.utils import create_simple_logger
 
 
 logger = create_simple_logger(__name__)
 
+DEFAULT_PDF_WORKERS = 5
+# PDF engines pandoc can drive for us. xelatex gives the best fidelity (math,
+# fonts); tectonic is a self-contained LaTeX engine with aggressive caching;
+# weasyprint renders via HTML/CSS and skips LaTeX startup entirely.
+PDF_ENGINES = ("xelatex", "tectonic", "weasyprint")
+# Engine options enabling shell escape, which the default preambles need for
+# minted. weasyprint never runs LaTeX, so it gets none.
+SHELL_ESCAPE_OPTS = {
+    "xelatex": "--pdf-engine-opt=-shell-escape",
+    "tectonic": "--pdf-engine-opt=-Zshell-escape",
+}
 
+
+@lru_cache(maxsize=1)
 def _check_pandoc_installed() -> bool:
     """Check if pandoc is installed by trying to get its version."""
     try:
@@ -25,6 +49,7 @@ def _check_pandoc_installed() -> bool:
         return False
 
 
+@lru_cache(maxsize=1)
 def _check_xelatex_installed() -> bool:
     """Check if xelatex is installed by trying to get its version."""
     try:
@@ -39,17 +64,34 @@ def _check_xelatex_installed() -> bool:
         return False
 
 
-def convert_markdown_to_pdf(
-    md_path: Path,
-    pdf_path: Optional[Path] = None,
-    remove_embedded_md: bool = True,
-    preamble: Optional[str] = None,
-) -> Path:
-    embedded_md_path = md_path.with_suffix(".embedded.md")
-    embed_images_reference_style(md_path, embedded_md_path, preamble=preamble)
-    logger.info(
-        f"Embedded images in markdown saved to {embedded_md_path}. Now converting to PDF."
-    )
+@lru_cache(maxsize=None)
+def _check_engine_installed(engine: str) -> bool:
+    """Check if a PDF engine is installed by trying to get its version."""
+    try:
+        result = subprocess.run(
+            [engine, "--version"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        return result.returncode == 0
+    except FileNotFoundError:
+        return False
+
+
+def reset_toolchain_cache() -> None:
+    """Forget the cached pandoc/engine availability so the next call probes again."""
+    _check_pandoc_installed.cache_clear()
+    _check_xelatex_installed.cache_clear()
+    _check_engine_installed.cache_clear()
+
+
+def _ensure_toolchain(engine: str = "xelatex") -> None:
+    """Raise an ``EnvironmentError`` with install hints if pandoc or the engine is missing."""
+    if engine not in PDF_ENGINES:
+        raise ValueError(
+            f"Unsupported PDF engine: {engine}. Must be one of {PDF_ENGINES}."
+        )
 
     if not _check_pandoc_installed():
         msg = (
@@ -60,6 +102,16 @@ def convert_markdown_to_pdf(
         logger.error(msg)
         raise EnvironmentError(msg)
 
+    if engine != "xelatex":
+        if not _check_engine_installed(engine):
+            msg = (
+                f"{engine} is not installed or not found in PATH. "
+                f"Please install {engine} or use the default xelatex engine."
+            )
+            logger.error(msg)
+            raise EnvironmentError(msg)
+        return
+
     if not _check_xelatex_installed():
         system = platform.system().lower()
         if system == "darwin":  # macOS
@@ -89,80 +141,418 @@ def convert_markdown_to_pdf(
         logger.error(msg)
         raise EnvironmentError(msg)
 
-    if pdf_path is None:
-        pdf_path = md_path.with_suffix(".pdf")
 
+def _pandoc_command(
+    source: Union[Path, bytes], pdf_path: Path, engine: str = "xelatex"
+) -> List[str]:
+    """Build the pandoc argument list; ``source`` bytes are read from stdin."""
+    # This deliberately shells out per document instead of talking to a
+    # long-lived ``pandoc-server``: the server only performs pure conversions,
+    # so it can neither run a PDF engine nor extract the data-URI images that
+    # the embedded markdown relies on.
     # Build pandoc command as a list for better cross-platform compatibility
     pandoc_cmd = [
         "pandoc",
         "--from=markdown+smart+emoji",
-        "--pdf-engine=xelatex",
-        "--pdf-engine-opt=-shell-escape",
+        f"--pdf-engine={engine}",
+        *([SHELL_ESCAPE_OPTS[engine]] if engine in SHELL_ESCAPE_OPTS else []),
         # Add macOS-specific options if needed
         "--variable",
         "geometry:margin=1in",
         "--variable",
         "fontsize=11pt",
-        str(embedded_md_path),
+        *([str(source)] if isinstance(source, Path) else []),
         "-o",
         str(pdf_path),
     ]
+    if engine == "xelatex" and XELATEX_FORMAT:
+        # Skip re-loading the fixed preamble on every run
+        pandoc_cmd.insert(-2, f"--pdf-engine-opt=-fmt={XELATEX_FORMAT}")
+    return pandoc_cmd
+
 
+def _pandoc_env() -> dict:
     # Set environment variables for consistent behavior across platforms
     env = os.environ.copy()
     env.update({"LANG": "C.UTF-8", "LC_ALL": "C.UTF-8"})
+    return env
 
+
+def _check_pandoc_result(returncode: int, stdout: bytes, stderr: bytes) -> None:
+    if returncode != 0:
+        error_msg = f"Pandoc command failed with exit code {returncode}"
+        if stderr:
+            error_msg += f"\nStderr: {stderr.decode('utf-8', 'replace')}"
+        if stdout:
+            error_msg += f"\nStdout: {stdout.decode('utf-8', 'replace')}"
+        logger.error(error_msg)
+        raise RuntimeError(error_msg)
+
+
+def _pandoc_not_found_error(e: FileNotFoundError) -> EnvironmentError:
+    system = platform.system().lower()
+    if system == "darwin":  # macOS
+        msg = (
+            "Pandoc or xelatex not found. Please ensure both are installed and in PATH:\n"
+            "1. Install pandoc: brew install pandoc\n"
+            "2. Install MacTeX: brew install mactex\n"
+            "3. After installation, restart your terminal or run: source ~/.zshrc\n"
+            "4. Check PATH: echo $PATH | grep -E '(pandoc|mactex|texlive)'\n"
+            f"Error: {e}"
+        )
+    elif system == "linux":
+        msg = (
+            "Pandoc or xelatex not found. Please ensure both are installed:\n"
+            "1. Install pandoc: sudo apt install pandoc\n"
+            "2. Install xelatex: sudo apt install texlive-xetex texlive-fonts-recommended\n"
+            f"Error: {e}"
+        )
+    else:
+        msg = (
+            "Pandoc or xelatex not found. Please ensure both are installed and in PATH.\n"
+            f"Error: {e}"
+        )
+    logger.error(msg)
+    return EnvironmentError(msg)
+
+
+def _run_pandoc(
+    source: Union[Path, bytes], pdf_path: Path, engine: str = "xelatex"
+) -> None:
+    """Render embedded markdown to ``pdf_path`` with pandoc and ``engine``.
+
+    ``source`` is either a path to an embedded markdown file or the embedded
+    markdown itself, which is piped to pandoc on stdin.
+    """
+    pandoc_cmd = _pandoc_command(source, pdf_path, engine)
     logger.info(f"Running pandoc command: {' '.join(pandoc_cmd)}")
 
     try:
         result = subprocess.run(
-            pandoc_cmd, env=env, capture_output=True, text=True, check=False
+            pandoc_cmd,
+            input=None if isinstance(source, Path) else source,
+            env=_pandoc_env(),
+            capture_output=True,
+            check=False,
         )
+        _check_pandoc_result(result.returncode, result.stdout, result.stderr)
+    except FileNotFoundError as e:
+        raise _pandoc_not_found_error(e) from e
+    except Exception as e:
+        msg = f"Unexpected error during PDF conversion: {e}"
+        logger.error(msg)
+        raise RuntimeError(msg) from e
 
-        if result.returncode != 0:
-            error_msg = f"Pandoc command failed with exit code {result.returncode}"
-            if result.stderr:
-                error_msg += f"\nStderr: {result.stderr}"
-            if result.stdout:
-                error_msg += f"\nStdout: {result.stdout}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+    logger.info(f"Converted markdown to PDF saved to {pdf_path}")
 
+
+async def _arun_pandoc(
+    source: Union[Path, bytes], pdf_path: Path, engine: str = "xelatex"
+) -> None:
+    """Async counterpart of ``_run_pandoc`` that does not block the event loop."""
+    pandoc_cmd = _pandoc_command(source, pdf_path, engine)
+    logger.info(f"Running pandoc command: {' '.join(pandoc_cmd)}")
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *pandoc_cmd,
+            stdin=None if isinstance(source, Path) else asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=_pandoc_env(),
+        )
+        stdout, stderr = await proc.communicate(
+            None if isinstance(source, Path) else source
+        )
+        _check_pandoc_result(proc.returncode, stdout, stderr)
     except FileNotFoundError as e:
-        system = platform.system().lower()
-        if system == "darwin":  # macOS
-            msg = (
-                "Pandoc or xelatex not found. Please ensure both are installed and in PATH:\n"
-                "1. Install pandoc: brew install pandoc\n"
-                "2. Install MacTeX: brew install mactex\n"
-                "3. After installation, restart your terminal or run: source ~/.zshrc\n"
-                "4. Check PATH: echo $PATH | grep -E '(pandoc|mactex|texlive)'\n"
-                f"Error: {e}"
-            )
-        elif system == "linux":
-            msg = (
-                "Pandoc or xelatex not found. Please ensure both are installed:\n"
-                "1. Install pandoc: sudo apt install pandoc\n"
-                "2. Install xelatex: sudo apt install texlive-xetex texlive-fonts-recommended\n"
-                f"Error: {e}"
-            )
-        else:
-            msg = (
-                "Pandoc or xelatex not found. Please ensure both are installed and in PATH.\n"
-                f"Error: {e}"
-            )
-        logger.error(msg)
-        raise EnvironmentError(msg) from e
+        raise _pandoc_not_found_error(e) from e
     except Exception as e:
         msg = f"Unexpected error during PDF conversion: {e}"
         logger.error(msg)
         raise RuntimeError(msg) from e
 
     logger.info(f"Converted markdown to PDF saved to {pdf_path}")
-    if remove_embedded_md:
-        try:
-            embedded_md_path.unlink()
-            logger.info(f"Removed temporary embedded markdown file {embedded_md_path}")
-        except Exception as e:
-            logger.warning(f"Failed to remove temporary file {embedded_md_path}: {e}")
+
+
+def _embedded_md_path(md_path: Path) -> Path:
+    """Where the embedded markdown for ``md_path`` is kept: ``*.embedded.md``."""
+    return md_path.with_suffix(".embedded.md")
+
+
+def _embed_source(
+    md_path: Path, preamble: Optional[str], keep_file: bool
+) -> Union[Path, bytes]:
+    """Embed images for ``md_path``, in memory unless the caller wants the file kept."""
+    if not keep_file:
+        return render_embedded_markdown(md_path, preamble=preamble)
+    embedded_md_path = _embedded_md_path(md_path)
+    # Write under a unique name and swap it in, so concurrent runs never see
+    # a half-written file
+    tmp_path = embedded_md_path.with_name(
+        f"{embedded_md_path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+    )
+    try:
+        embed_images_reference_style(md_path, tmp_path, preamble=preamble)
+        os.replace(tmp_path, embedded_md_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    logger.info(f"Embedded images in markdown saved to {embedded_md_path}.")
+    return embedded_md_path
+
+
+def _conversion_fingerprint(md_path: Path, preamble: Optional[str], engine: str) -> str:
+    """Digest of everything that affects the PDF: source, images and options."""
+    md_bytes = md_path.read_bytes()
+    h = hashlib.blake2b(md_bytes, digest_size=16)
+    images = local_image_paths(md_bytes.decode("utf-8"), md_path.parent)
+    for image_path in sorted(images.values()):
+        stat = image_path.stat()
+        h.update(f"\0{image_path}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+    for option in (preamble, engine, XELATEX_FORMAT):
+        h.update(f"\0{option or ''}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _fingerprint_path(pdf_path: Path) -> Path:
+    return pdf_path.with_name(pdf_path.name + ".meta.json")
+
+
+def _is_up_to_date(pdf_path: Path, fingerprint: str) -> bool:
+    """Whether ``pdf_path`` was already rendered from inputs matching ``fingerprint``."""
+    if not pdf_path.exists():
+        return False
+    try:
+        meta = json.loads(_fingerprint_path(pdf_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return meta.get("fingerprint") == fingerprint
+
+
+def _record_fingerprint(pdf_path: Path, fingerprint: str) -> None:
+    try:
+        _fingerprint_path(pdf_path).write_text(
+            json.dumps({"fingerprint": fingerprint}), encoding="utf-8"
+        )
+    except OSError as e:
+        logger.warning(f"Failed to record fingerprint for {pdf_path}: {e}")
+
+
+def convert_markdown_to_pdf(
+    md_path: Path,
+    pdf_path: Optional[Path] = None,
+    remove_embedded_md: bool = True,
+    preamble: Optional[str] = None,
+    engine: str = "xelatex",
+) -> Path:
+    """Convert a markdown file with local images to a self-contained PDF.
+
+    ``engine`` selects the pandoc PDF engine. The default xelatex has the best
+    LaTeX math and font support; tectonic produces the same LaTeX output with
+    faster repeated runs; weasyprint goes through HTML/CSS, which starts much
+    faster but renders math and page layout less faithfully. weasyprint also
+    ignores the LaTeX ``header-includes`` of the preamble.
+
+    If the PDF was already rendered from an identical source, images and
+    options, it is returned as is (unless the embedded markdown is requested).
+    """
+    if pdf_path is None:
+        pdf_path = md_path.with_suffix(".pdf")
+
+    fingerprint = _conversion_fingerprint(md_path, preamble, engine)
+    if remove_embedded_md and _is_up_to_date(pdf_path, fingerprint):
+        logger.info(f"{pdf_path} is up to date, skipping conversion.")
+        return pdf_path
+
+    source = _embed_source(md_path, preamble, keep_file=not remove_embedded_md)
+    logger.info(f"Embedded images in {md_path}. Now converting to PDF.")
+
+    _ensure_toolchain(engine)
+
+    _run_pandoc(source, pdf_path, engine)
+    _record_fingerprint(pdf_path, fingerprint)
+    return pdf_path
+
+
+def convert_markdown_to_pdf_batch(
+    md_paths: List[Path],
+    remove_embedded_md: bool = True,
+    preamble: Optional[str] = None,
+    engine: str = "xelatex",
+) -> List[Path]:
+    """Convert several markdown files to PDF, sharing the per-call setup.
+
+    All inputs are embedded up front in parallel and the toolchain is checked
+    once; pandoc then renders each document next to its source.
+
+    Parameters
+    ----------
+    md_paths : List[Path]
+        Markdown files to convert.
+    remove_embedded_md : bool
+        If False, the embedded markdown is also written to ``*.embedded.md``
+        files; otherwise it is only piped to pandoc.
+    preamble : Optional[str]
+        YAML preamble applied to every document.
+    engine : str
+        PDF engine, one of ``PDF_ENGINES``.
+
+    Returns
+    -------
+    List[Path]
+        The generated PDF paths, in the same order as ``md_paths``.
+    """
+    md_paths = [Path(p) for p in md_paths]
+    pdf_paths = [p.with_suffix(".pdf") for p in md_paths]
+    fingerprints = [_conversion_fingerprint(p, preamble, engine) for p in md_paths]
+    pending = [
+        i
+        for i, (pdf_path, fingerprint) in enumerate(zip(pdf_paths, fingerprints))
+        if not (remove_embedded_md and _is_up_to_date(pdf_path, fingerprint))
+    ]
+    if not pending:
+        logger.info("All PDFs are up to date, skipping conversion.")
+        return pdf_paths
+
+    with ThreadPoolExecutor() as executor:
+        sources = list(
+            executor.map(
+                lambda i: _embed_source(
+                    md_paths[i], preamble, keep_file=not remove_embedded_md
+                ),
+                pending,
+            )
+        )
+    logger.info(
+        f"Embedded images for {len(pending)} markdown files. Now converting to PDF."
+    )
+
+    _ensure_toolchain(engine)
+
+    for i, source in zip(pending, sources):
+        _run_pandoc(source, pdf_paths[i], engine)
+        _record_fingerprint(pdf_paths[i], fingerprints[i])
+    return pdf_paths
+
+
+def convert_markdown_to_pdf_parallel(
+    md_paths: List[Path],
+    workers: int = DEFAULT_PDF_WORKERS,
+    remove_embedded_md: bool = True,
+    preamble: Optional[str] = None,
+    engine: str = "xelatex",
+) -> List[Path]:
+    """Convert several markdown files to PDF concurrently.
+
+    Each conversion is CPU-bound inside its own pandoc/xelatex process, so a
+    thread pool is enough to keep ``workers`` of them running at once.
+
+    Parameters
+    ----------
+    md_paths : List[Path]
+        Markdown files to convert.
+    workers : int
+        Maximum number of concurrent conversions (capped at the CPU count).
+    remove_embedded_md : bool
+        If False, the embedded markdown is also written to ``*.embedded.md``
+        files; otherwise it is only piped to pandoc.
+    preamble : Optional[str]
+        YAML preamble applied to every document.
+    engine : str
+        PDF engine, one of ``PDF_ENGINES``.
+
+    Returns
+    -------
+    List[Path]
+        The generated PDF paths, in the same order as ``md_paths``.
+    """
+    max_workers = max(1, min(os.cpu_count() or 1, workers))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                convert_markdown_to_pdf,
+                Path(md_path),
+                remove_embedded_md=remove_embedded_md,
+                preamble=preamble,
+                engine=engine,
+            )
+            for md_path in md_paths
+        ]
+        return [future.result() for future in futures]
+
+
+async def aconvert_markdown_to_pdf(
+    md_path: Path,
+    pdf_path: Optional[Path] = None,
+    remove_embedded_md: bool = True,
+    preamble: Optional[str] = None,
+    engine: str = "xelatex",
+) -> Path:
+    """Async version of ``convert_markdown_to_pdf``.
+
+    Embedding runs in a worker thread and pandoc in an asyncio subprocess, so
+    several conversions can overlap on one event loop.
+    """
+    md_path = Path(md_path)
+    if pdf_path is None:
+        pdf_path = md_path.with_suffix(".pdf")
+
+    fingerprint = await asyncio.to_thread(
+        _conversion_fingerprint, md_path, preamble, engine
+    )
+    if remove_embedded_md and _is_up_to_date(pdf_path, fingerprint):
+        logger.info(f"{pdf_path} is up to date, skipping conversion.")
+        return pdf_path
+
+    source = await asyncio.to_thread(
+        _embed_source, md_path, preamble, not remove_embedded_md
+    )
+    logger.info(f"Embedded images in {md_path}. Now converting to PDF.")
+
+    await asyncio.to_thread(_ensure_toolchain, engine)
+
+    await _arun_pandoc(source, pdf_path, engine)
+    _record_fingerprint(pdf_path, fingerprint)
     return pdf_path
+
+
+async def aconvert_markdown_to_pdf_many(
+    md_paths: List[Path],
+    max_concurrency: int = DEFAULT_PDF_WORKERS,
+    remove_embedded_md: bool = True,
+    preamble: Optional[str] = None,
+    engine: str = "xelatex",
+) -> List[Path]:
+    """Convert several markdown files to PDF concurrently on the event loop.
+
+    Parameters
+    ----------
+    md_paths : List[Path]
+        Markdown files to convert.
+    max_concurrency : int
+        Maximum number of conversions in flight at once.
+    remove_embedded_md : bool
+        If False, the embedded markdown is also written to ``*.embedded.md``
+        files; otherwise it is only piped to pandoc.
+    preamble : Optional[str]
+        YAML preamble applied to every document.
+    engine : str
+        PDF engine, one of ``PDF_ENGINES``.
+
+    Returns
+    -------
+    List[Path]
+        The generated PDF paths, in the same order as ``md_paths``.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _convert(md_path: Path) -> Path:
+        async with semaphore:
+            return await aconvert_markdown_to_pdf(
+                md_path,
+                remove_embedded_md=remove_embedded_md,
+                preamble=preamble,
+                engine=engine,
+            )
+
+    return list(await asyncio.gather(*(_convert(p) for p in md_paths)))
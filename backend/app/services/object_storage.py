@@ -1,18 +1,143 @@
 from app.utils import create_simple_logger
 
+import copy
+import io
 import os
 import logging
-from typing import Iterable, Optional, Dict, Any, List, Union, BinaryIO
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, quote, urlsplit
+from typing import Iterable, Optional, Dict, Any, List, Set, Tuple, Union, BinaryIO
 import boto3
+from botocore.awsrequest import AWSRequest
 from botocore.config import Config
 from botocore.exceptions import ClientError
-from boto3.s3.transfer import TransferConfig
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+
+try:
+    import awscrt  # noqa: F401  (installed via boto3[crt])
+
+    HAS_CRT = True
+except ImportError:
+    HAS_CRT = False
 
 logger = logging.getLogger(__name__)
 
 
 logger = create_simple_logger(__name__)
 
+# Objects larger than this are read with parallel ranged GETs
+PARALLEL_READ_THRESHOLD = 16 * 1024 * 1024
+PARALLEL_READ_PARTS = 8
+READ_CHUNK_SIZE = 1024 * 1024
+# Concurrent delete_objects requests issued by delete_prefix
+DELETE_WORKERS = 8
+# Objects above this size are copied server-side as parallel multipart parts
+MULTIPART_COPY_THRESHOLD = 100 * 1024 * 1024
+MULTIPART_COPY_PART_SIZE = 64 * 1024 * 1024
+MULTIPART_COPY_WORKERS = 16
+# S3 allows at most 10000 parts per upload
+MAX_MULTIPART_PARTS = 10000
+# Object headers a server-side copy keeps; multipart copies set them explicitly
+COPIED_HEAD_FIELDS = (
+    "CacheControl",
+    "ContentDisposition",
+    "ContentEncoding",
+    "ContentLanguage",
+    "ContentType",
+    "Expires",
+)
+# Client methods generate_presigned_urls can sign directly
+PRESIGN_HTTP_METHODS = {"get_object": "GET", "put_object": "PUT"}
+
+# Enough pooled connections for parallel reads/deletes/transfers, keepalive for
+# reuse, and adaptive retries so throttling backs off client-side
+DEFAULT_MAX_POOL_CONNECTIONS = 64
+DEFAULT_CLIENT_CONFIG = {
+    "tcp_keepalive": True,
+    "retries": {"mode": "adaptive", "max_attempts": 5},
+}
+
+# boto3 clients are thread-safe, so instances with the same connection settings
+# share one client (and its connection pool) instead of building their own.
+_CLIENT_CACHE: Dict[Tuple, Any] = {}
+_client_cache_lock = threading.Lock()
+
+
+def _default_transfer_client(
+    endpoint_url: Optional[str], use_ssl: Optional[bool]
+) -> str:
+    """
+    Pick the transfer client for the default TransferConfig.
+    boto3's CRT client always talks to the AWS regional endpoint over TLS, ignoring
+    endpoint_url and use_ssl, so it is only used against AWS S3 itself; custom
+    endpoints (e.g. MinIO) stay on the classic client.
+    """
+    if HAS_CRT and endpoint_url is None and use_ssl is not False:
+        # Native multipart transfers, bypassing Python-level chunking
+        return "crt"
+    return "classic"
+
+
+def _get_s3_client(
+    endpoint_url: Optional[str],
+    region_name: Optional[str],
+    access_key: Optional[str],
+    secret_key: Optional[str],
+    use_ssl: Optional[bool],
+    extra_config: Optional[Dict[str, Any]] = None,
+):
+    """Return a shared S3 client for the given connection settings."""
+    extra_config = extra_config or {}
+    cache_key = (
+        endpoint_url,
+        region_name,
+        access_key,
+        secret_key,
+        use_ssl,
+        tuple(sorted((k, repr(v)) for k, v in extra_config.items())),
+    )
+    with _client_cache_lock:
+        client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            # Signature v4 is broadly compatible and recommended. Config
+            # normalises nested dicts (e.g. retries) in place, so pass a copy
+            # to keep the cache key and DEFAULT_CLIENT_CONFIG unchanged.
+            cfg = Config(signature_version="s3v4", **copy.deepcopy(extra_config))
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                region_name=region_name,
+                use_ssl=use_ssl,
+                config=cfg,
+            )
+            _CLIENT_CACHE[cache_key] = client
+        return client
+
+
+class _IterableStream(io.RawIOBase):
+    """Read-only, non-seekable file object over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
 
 class S3Storage:
     """
@@ -20,6 +145,10 @@ class S3Storage:
     Works with AWS S3 and any S3-compatible service (e.g., MinIO) by configuring endpoint_url.
     """
 
+    # (endpoint_url, bucket) pairs already checked/created in this process
+    _verified_buckets: Set[Tuple[Optional[str], str]] = set()
+    _verified_buckets_lock = threading.Lock()
+
     def __init__(
         self,
         bucket: str,
@@ -30,6 +159,7 @@ class S3Storage:
         use_ssl: Optional[bool] = None,
         extra_config: Optional[Dict[str, Any]] = None,
         transfer_cfg: Optional[TransferConfig] = None,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
     ):
         self.bucket = bucket
         self.endpoint_url = endpoint_url or os.getenv("S3_ENDPOINT_URL")
@@ -45,25 +175,45 @@ class S3Storage:
             f"and region '{self.region_name}'"
         )
 
-        # Signature v4 is broadly compatible and recommended
-        cfg = Config(signature_version="s3v4", **(extra_config or {}))
-
-        self.client = boto3.client(
-            "s3",
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key,
-            region_name=self.region_name,
-            use_ssl=self.use_ssl,
-            config=cfg,
+        self.client = _get_s3_client(
+            self.endpoint_url,
+            self.region_name,
+            self.access_key,
+            self.secret_key,
+            self.use_ssl,
+            {
+                "max_pool_connections": max_pool_connections,
+                **DEFAULT_CLIENT_CONFIG,
+                **(extra_config or {}),
+            },
         )
 
         # Automatically handles multipart uploads for large files
-        self.transfer_cfg = transfer_cfg or TransferConfig()
+        self.transfer_cfg = transfer_cfg or TransferConfig(
+            preferred_transfer_client=_default_transfer_client(
+                self.endpoint_url, self.use_ssl
+            ),
+            max_concurrency=10,
+            multipart_threshold=8 * 1024 * 1024,
+        )
+        # One long-lived manager instead of a new one per upload/download
+        self.transfer_manager = create_transfer_manager(self.client, self.transfer_cfg)
         self.ensure_bucket()
 
-    def ensure_bucket(self) -> None:
-        """Create the bucket if it doesn't exist."""
+    def ensure_bucket(self, force: bool = False) -> None:
+        """
+        Create the bucket if it doesn't exist.
+        Buckets already verified in this process are skipped unless force=True.
+        """
+        bucket_key = (self.endpoint_url, self.bucket)
+        if not force and bucket_key in self._verified_buckets:
+            logger.debug(f"Bucket '{self.bucket}' already verified, skipping check")
+            return
+        self._create_bucket_if_missing()
+        with self._verified_buckets_lock:
+            self._verified_buckets.add(bucket_key)
+
+    def _create_bucket_if_missing(self) -> None:
         try:
             logger.debug(f"Checking if bucket '{self.bucket}' exists")
             self.client.head_bucket(Bucket=self.bucket)
@@ -131,45 +281,158 @@ class S3Storage:
     ) -> None:
         """Upload a local file to the given key."""
         logger.info(f"Uploading file from '{local_path}' to '{self.bucket}/{key}'")
-        self.client.upload_file(
-            Filename=local_path,
-            Bucket=self.bucket,
-            Key=key,
-            ExtraArgs=extra_args or {},
-            Config=self.transfer_cfg,
-        )
+        self.transfer_manager.upload(
+            local_path, self.bucket, key, extra_args=extra_args or None
+        ).result()
         logger.info(f"Successfully uploaded '{key}'")
 
     def write_bytes(
         self,
         key: str,
-        data: Union[bytes, BinaryIO],
+        data: Union[bytes, BinaryIO, Iterable[bytes]],
         content_type: Optional[str] = None,
         extra_args: Optional[Dict[str, Any]] = None,
     ) -> None:
-        """Upload in-memory bytes or a file-like stream."""
+        """
+        Upload in-memory bytes, a file-like stream, or an iterable of byte chunks.
+        Iterables are streamed through the transfer manager (multipart when large),
+        so the full payload is never held in memory.
+        """
         logger.debug(f"Uploading bytes to '{self.bucket}/{key}'")
+        if not isinstance(data, (bytes, bytearray, memoryview)) and not hasattr(
+            data, "read"
+        ):
+            args = dict(extra_args or {})
+            if content_type:
+                args["ContentType"] = content_type
+            # Buffered so every read returns a full part, as multipart requires
+            stream = io.BufferedReader(_IterableStream(data))
+            self.transfer_manager.upload(
+                stream, self.bucket, key, extra_args=args or None
+            ).result()
+            logger.debug(f"Successfully streamed bytes to '{key}'")
+            return
+
+        body = data  # bytes or file-like object
+        if not extra_args and not content_type:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=body)
+        else:
+            args = dict(extra_args or {})
+            if content_type:
+                args["ContentType"] = content_type
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=body, **args)
+        logger.debug(f"Successfully uploaded bytes to '{key}'")
+
+    def write_fileobj(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Upload a file-like object from its current position.
+        Large objects go up as concurrent multipart parts read one at a time, so
+        memory stays bounded by part size x concurrency rather than the file size.
+        """
+        logger.info(f"Uploading stream to '{self.bucket}/{key}'")
         args = dict(extra_args or {})
         if content_type:
             args["ContentType"] = content_type
-        body = data  # bytes or file-like object
-        self.client.put_object(Bucket=self.bucket, Key=key, Body=body, **args)
-        logger.debug(f"Successfully uploaded bytes to '{key}'")
+        self.transfer_manager.upload(
+            fileobj, self.bucket, key, extra_args=args or None
+        ).result()
+        logger.info(f"Successfully uploaded '{key}'")
 
     def copy(
-        self, src_key: str, dst_key: str, extra_args: Optional[Dict[str, Any]] = None
+        self,
+        src_key: str,
+        dst_key: str,
+        extra_args: Optional[Dict[str, Any]] = None,
+        force_multipart: bool = False,
+        part_size: int = MULTIPART_COPY_PART_SIZE,
+        size: Optional[int] = None,
     ) -> None:
-        """Copy an object within the same bucket."""
+        """
+        Copy an object within the same bucket.
+        Objects larger than MULTIPART_COPY_THRESHOLD (or any non-empty object when
+        force_multipart is set) are copied as parallel UploadPartCopy requests.
+        Pass the source ``size`` when it is known (e.g. from a listing) to skip
+        the HEAD request for objects that are copied in one request.
+        """
         logger.info(f"Copying '{src_key}' to '{dst_key}' in bucket '{self.bucket}'")
         copy_source = {"Bucket": self.bucket, "Key": src_key}
-        self.client.copy(
-            CopySource=copy_source,
-            Bucket=self.bucket,
-            Key=dst_key,
-            ExtraArgs=extra_args or {},
-        )
+        head = None
+        if size is None or force_multipart or size > MULTIPART_COPY_THRESHOLD:
+            head = self.head(src_key)
+            size = head["ContentLength"]
+        # An empty object has no byte range to copy in parts
+        if size and (force_multipart or size > MULTIPART_COPY_THRESHOLD):
+            self._multipart_copy(copy_source, dst_key, head, extra_args, part_size)
+        else:
+            self.client.copy_object(
+                CopySource=copy_source,
+                Bucket=self.bucket,
+                Key=dst_key,
+                **(extra_args or {}),
+            )
         logger.info(f"Successfully copied '{src_key}' to '{dst_key}'")
 
+    def _multipart_copy(
+        self,
+        copy_source: Dict[str, str],
+        dst_key: str,
+        head: Dict[str, Any],
+        extra_args: Optional[Dict[str, Any]],
+        part_size: int,
+    ) -> None:
+        size = head["ContentLength"]
+        part_size = max(part_size, -(-size // MAX_MULTIPART_PARTS))
+        # Multipart uploads don't inherit headers or metadata, so carry them
+        # over explicitly; extra_args replace them as with MetadataDirective=REPLACE
+        create_args = {"Metadata": head.get("Metadata", {})}
+        for field in COPIED_HEAD_FIELDS:
+            if head.get(field):
+                create_args[field] = head[field]
+        create_args.update(extra_args or {})
+        create_args.pop("MetadataDirective", None)
+
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=dst_key, **create_args
+        )["UploadId"]
+
+        def copy_part(part_number: int, start: int) -> Dict[str, Any]:
+            end = min(start + part_size, size) - 1
+            resp = self.client.upload_part_copy(
+                Bucket=self.bucket,
+                Key=dst_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                CopySource=copy_source,
+                CopySourceRange=f"bytes={start}-{end}",
+            )
+            return {"PartNumber": part_number, "ETag": resp["CopyPartResult"]["ETag"]}
+
+        starts = range(0, size, part_size)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(MULTIPART_COPY_WORKERS, len(starts))
+            ) as pool:
+                parts = list(pool.map(copy_part, range(1, len(starts) + 1), starts))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=dst_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            logger.error(f"Multipart copy to '{dst_key}' failed, aborting upload")
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=dst_key, UploadId=upload_id
+            )
+            raise
+        logger.debug(f"Copied {size} bytes to '{dst_key}' in {len(parts)} parts")
+
     def move(self, src_key: str, dst_key: str) -> None:
         """Move (copy then delete) an object."""
         logger.info(f"Moving '{src_key}' to '{dst_key}' in bucket '{self.bucket}'")
@@ -180,18 +443,99 @@ class S3Storage:
     def read_file(self, key: str, local_path: str) -> None:
         """Download an object to a local path."""
         logger.info(f"Downloading '{self.bucket}/{key}' to '{local_path}'")
-        self.client.download_file(
-            Bucket=self.bucket, Key=key, Filename=local_path, Config=self.transfer_cfg
-        )
+        self.transfer_manager.download(self.bucket, key, local_path).result()
         logger.info(f"Successfully downloaded '{key}'")
 
-    def read_bytes(self, key: str) -> bytes:
-        """Read an object into memory."""
+    def read_bytes(
+        self,
+        key: str,
+        parallel_threshold: int = PARALLEL_READ_THRESHOLD,
+        parts: int = PARALLEL_READ_PARTS,
+    ) -> Union[bytes, bytearray]:
+        """
+        Read an object into memory.
+        The first request fetches at most ``parallel_threshold`` bytes; if the object
+        is larger, the rest is fetched as ``parts`` ranged GETs in parallel, each
+        written straight into one preallocated buffer, which is returned as is
+        (a ``bytearray``) rather than copied.
+        """
+        return self.read_object(key, parallel_threshold, parts)[0]
+
+    def read_object(
+        self,
+        key: str,
+        parallel_threshold: int = PARALLEL_READ_THRESHOLD,
+        parts: int = PARALLEL_READ_PARTS,
+    ) -> Tuple[Union[bytes, bytearray], Dict[str, Any]]:
+        """
+        Read an object into memory along with its GET response headers
+        (ContentType, ContentEncoding, Metadata, ...). See read_bytes.
+        """
         logger.debug(f"Reading bytes from '{self.bucket}/{key}'")
-        resp = self.client.get_object(Bucket=self.bucket, Key=key)
-        data = resp["Body"].read()
-        logger.debug(f"Successfully read {len(data)} bytes from '{key}'")
-        return data
+        try:
+            resp = self.client.get_object(
+                Bucket=self.bucket, Key=key, Range=f"bytes=0-{parallel_threshold - 1}"
+            )
+        except ClientError as e:
+            # Empty objects can't satisfy a byte range
+            if e.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+            resp = self.client.get_object(Bucket=self.bucket, Key=key)
+
+        content_range = resp.get("ContentRange")
+        total = (
+            int(content_range.rsplit("/", 1)[1])
+            if content_range
+            else resp["ContentLength"]
+        )
+        headers = {k: v for k, v in resp.items() if k != "Body"}
+        if total <= parallel_threshold:
+            data = resp["Body"].read()
+            logger.debug(f"Successfully read {len(data)} bytes from '{key}'")
+            return data, headers
+
+        buf = bytearray(total)
+        view = memoryview(buf)
+        self._read_body_into(resp["Body"], view[:parallel_threshold])
+
+        # Pin the remaining ranges to the version we started reading
+        etag = resp.get("ETag")
+        step = -(-(total - parallel_threshold) // max(1, parts))
+        ranges = [
+            (start, min(start + step, total))
+            for start in range(parallel_threshold, total, step)
+        ]
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [
+                pool.submit(self._read_range_into, key, view[start:end], start, etag)
+                for start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+
+        logger.debug(
+            f"Successfully read {total} bytes from '{key}' in {len(ranges) + 1} ranges"
+        )
+        return buf, headers
+
+    def _read_range_into(
+        self, key: str, view: memoryview, start: int, etag: Optional[str]
+    ) -> None:
+        params = {"Bucket": self.bucket, "Key": key}
+        params["Range"] = f"bytes={start}-{start + len(view) - 1}"
+        if etag:
+            params["IfMatch"] = etag
+        resp = self.client.get_object(**params)
+        self._read_body_into(resp["Body"], view)
+
+    @staticmethod
+    def _read_body_into(body, view: memoryview) -> None:
+        pos = 0
+        for chunk in body.iter_chunks(READ_CHUNK_SIZE):
+            view[pos : pos + len(chunk)] = chunk
+            pos += len(chunk)
+        if pos != len(view):
+            raise IOError(f"Expected {len(view)} bytes but received {pos}")
 
     def delete_file(self, key: str) -> None:
         """Delete a single object."""
@@ -199,75 +543,74 @@ class S3Storage:
         self.client.delete_object(Bucket=self.bucket, Key=key)
         logger.info(f"Successfully deleted '{key}'")
 
-    def delete_prefix(self, prefix: str) -> int:
+    def delete_prefix(self, prefix: str, max_workers: int = DELETE_WORKERS) -> int:
         """
         Delete all objects under a prefix ("folder"). Returns number of deleted objects.
+        Listing and deleting are pipelined: each page of up to 1000 keys is handed to
+        a worker pool while the next page is being listed.
         """
         logger.info(f"Deleting all objects under prefix '{self.bucket}/{prefix}'")
         paginator = self.client.get_paginator("list_objects_v2")
-        count = 0
-
-        # Collect all keys to delete
-        keys_to_delete = []
-        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
-            for obj in page.get("Contents", []):
-                keys_to_delete.append(obj["Key"])
 
-        if not keys_to_delete:
+        # Bound the number of listed-but-not-yet-deleted batches held in memory
+        in_flight = threading.BoundedSemaphore(max_workers * 2)
+        futures = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                batch = [obj["Key"] for obj in page.get("Contents", [])]
+                if not batch:
+                    continue
+                in_flight.acquire()
+                future = pool.submit(self._delete_batch, batch)
+                future.add_done_callback(lambda _: in_flight.release())
+                futures.append(future)
+
+        if not futures:
             logger.info(f"No objects found under prefix '{prefix}'")
             return 0
 
-        logger.debug(f"Found {len(keys_to_delete)} objects to delete")
+        count = sum(future.result() for future in futures)
+        logger.info(f"Successfully deleted {count} objects under prefix '{prefix}'")
+        return count
 
-        # Try batch delete first, fall back to individual deletes if it fails
+    def _delete_batch(self, keys: List[str]) -> int:
+        """Delete up to 1000 keys (AWS S3 limit) in one request, falling back to single deletes."""
+        delete_dict = {"Objects": [{"Key": key} for key in keys]}
         try:
-            # Delete in batches of 1000 (AWS S3 limit)
-            for i in range(0, len(keys_to_delete), 1000):
-                batch = keys_to_delete[i : i + 1000]
-                delete_dict = {"Objects": [{"Key": key} for key in batch]}
-
-                try:
-                    response = self.client.delete_objects(
-                        Bucket=self.bucket, Delete=delete_dict
-                    )
-                    deleted = len(response.get("Deleted", []))
-                    count += deleted
-                    logger.debug(
-                        f"Batch deleted {deleted} objects ({count} total so far)"
-                    )
-
-                except ClientError as batch_error:
-                    error_code = batch_error.response.get("Error", {}).get("Code")
-                    # MinIO sometimes requires Content-MD5, fall back to individual deletes
-                    if error_code in ["MissingContentMD5", "InvalidRequest"]:
-                        logger.warning(
-                            f"Batch delete failed with {error_code}, falling back to individual deletes"
-                        )
-                        for key in batch:
-                            try:
-                                self.client.delete_object(Bucket=self.bucket, Key=key)
-                                count += 1
-                            except Exception as del_err:
-                                logger.warning(f"Failed to delete {key}: {del_err}")
-                    else:
-                        raise
-
-        except Exception as e:
-            logger.error(f"Error during batch delete: {e}")
-            # Fall back to individual deletes for remaining keys
-            logger.info("Falling back to individual delete operations")
-            for key in keys_to_delete[count:]:
-                try:
-                    self.client.delete_object(Bucket=self.bucket, Key=key)
-                    count += 1
-                    if count % 100 == 0:
-                        logger.debug(f"Deleted {count} objects so far")
-                except Exception as del_err:
-                    logger.warning(f"Failed to delete {key}: {del_err}")
+            response = self.client.delete_objects(
+                Bucket=self.bucket, Delete=delete_dict
+            )
+            deleted = len(response.get("Deleted", []))
+            logger.debug(f"Batch deleted {deleted} objects")
+            return deleted
+        except Exception as batch_error:
+            error_code = (
+                batch_error.response.get("Error", {}).get("Code")
+                if isinstance(batch_error, ClientError)
+                else None
+            )
+            # MinIO sometimes requires Content-MD5, fall back to individual deletes
+            if error_code in ["MissingContentMD5", "InvalidRequest"]:
+                logger.warning(
+                    f"Batch delete failed with {error_code}, falling back to individual deletes"
+                )
+            else:
+                logger.error(f"Error during batch delete: {batch_error}")
+                logger.info("Falling back to individual delete operations")
 
-        logger.info(f"Successfully deleted {count} objects under prefix '{prefix}'")
+        count = 0
+        for key in keys:
+            try:
+                self.client.delete_object(Bucket=self.bucket, Key=key)
+                count += 1
+            except Exception as del_err:
+                logger.warning(f"Failed to delete {key}: {del_err}")
         return count
 
+    def head(self, key: str) -> Dict[str, Any]:
+        """Return the object's HEAD response (size, content type/encoding, metadata)."""
+        return self.client.head_object(Bucket=self.bucket, Key=key)
+
     def exists(self, key: str) -> bool:
         """Return True if the object exists, False otherwise."""
         try:
@@ -279,6 +622,34 @@ class S3Storage:
                 return False
             raise
 
+    def exists_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check existence of many keys with list requests instead of one HEAD per key.
+        Keys are grouped by "folder" and only the key range spanned by each group is
+        listed, so N keys in one folder cost about ceil(N/1000) requests.
+        """
+        result = {key: False for key in keys}
+        groups: Dict[str, List[str]] = {}
+        for key in result:
+            folder = key.rpartition("/")[0] + "/" if "/" in key else ""
+            groups.setdefault(folder, []).append(key)
+
+        paginator = self.client.get_paginator("list_objects_v2")
+        for folder, group in groups.items():
+            group.sort()
+            params = {"Bucket": self.bucket, "Prefix": folder, "Delimiter": "/"}
+            # StartAfter is exclusive; anything before the first wanted key is skipped
+            if group[0][:-1]:
+                params["StartAfter"] = group[0][:-1]
+            for page in paginator.paginate(**params):
+                contents = page.get("Contents", [])
+                for obj in contents:
+                    if obj["Key"] in result:
+                        result[obj["Key"]] = True
+                if contents and contents[-1]["Key"] >= group[-1]:
+                    break
+        return result
+
     def list_files(self, prefix: str = "", recursive: bool = True):
         """
         Yield keys under prefix.
@@ -296,6 +667,18 @@ class S3Storage:
                 for obj in page.get("Contents", []):
                     yield obj["Key"]
 
+    def list_file_sizes(self, prefix: str = "", recursive: bool = True):
+        """
+        Yield (key, size in bytes) for objects under prefix, like list_files.
+        """
+        paginator = self.client.get_paginator("list_objects_v2")
+        params = {"Bucket": self.bucket, "Prefix": prefix}
+        if not recursive:
+            params["Delimiter"] = "/"
+        for page in paginator.paginate(**params):
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["Size"]
+
     def list_folders(self, prefix: str = ""):
         """
         Yield immediate child 'folders' (common prefixes) under prefix.
@@ -343,3 +726,50 @@ class S3Storage:
         )
         logger.debug(f"Generated presigned URL for '{key}'")
         return url
+
+    def generate_presigned_urls(
+        self,
+        keys: List[str],
+        expiration: int = 3600,
+        method: str = "get_object",
+    ) -> List[str]:
+        """
+        Generate presigned URLs for many keys at once.
+        The first URL comes from generate_presigned_url; the rest reuse its base URL
+        and a single SigV4 query signer, skipping the per-call parameter validation
+        and endpoint resolution. The signer is built by the client's own request
+        signer, for the signing region and service named in the first URL.
+        """
+        if not keys:
+            return []
+        first = self.generate_presigned_url(keys[0], expiration, method)
+
+        http_method = PRESIGN_HTTP_METHODS.get(method)
+        signer = getattr(self.client, "_request_signer", None)
+        parts = urlsplit(first)
+        # AKID/date/region/service/aws4_request
+        scope = parse_qs(parts.query).get("X-Amz-Credential", [""])[0].split("/")
+        quoted_key = quote(keys[0], safe="/~")
+        if (
+            http_method is None
+            or signer is None
+            or len(scope) != 5
+            or not parts.path.endswith(quoted_key)
+        ):
+            return [first] + [
+                self.generate_presigned_url(key, expiration, method) for key in keys[1:]
+            ]
+
+        base_url = f"{parts.scheme}://{parts.netloc}{parts.path[: -len(quoted_key)]}"
+        auth = signer.get_auth_instance(
+            scope[3], scope[2], "s3v4-query", expires=expiration
+        )
+        urls = [first]
+        for key in keys[1:]:
+            request = AWSRequest(
+                method=http_method, url=base_url + quote(key, safe="/~")
+            )
+            auth.add_auth(request)
+            urls.append(request.url)
+        logger.debug(f"Generated {len(urls)} presigned URLs")
+        return urls
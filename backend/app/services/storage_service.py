@@ -11,11 +11,22 @@ Bucket Structure:
           └── notes/                     # Generated artifacts (MD, PDF)
 """
 
+import gzip
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Union
+from typing import BinaryIO, Dict, Iterable, Optional, List, Tuple, Union
 
-from app.env import S3_ENDPOINT_URL, S3_ACCESS_KEY, S3_SECRET_KEY, S3_USE_SSL
+from cachetools import TTLCache
+
+from app.env import (
+    S3_ENDPOINT_URL,
+    S3_ACCESS_KEY,
+    S3_SECRET_KEY,
+    S3_USE_SSL,
+    S3_WARM_USERS,
+)
 from app.services.object_storage import S3Storage
 from app.utils import create_simple_logger
 
@@ -34,6 +45,26 @@ VALID_ARTIFACT_TYPES = [
     ARTIFACT_NOTES,
 ]
 
+# Notes files reported by get_notes_files_status, keyed as e.g. "final_notes_md"
+NOTES_STATUS_FILES = ("final_notes.md", "final_notes.pdf", "summary.md", "summary.pdf")
+
+# Workers used to fan out independent per-prefix S3 requests
+STORAGE_WORKERS = 16
+
+# Short-lived caches for repeated reads from the pipeline and status polls.
+# Missing files are remembered for less time so new uploads show up quickly.
+CACHE_MAX_ENTRIES = 256
+TRANSCRIPT_CACHE_TTL = 30
+EXISTS_CACHE_TTL = 60
+MISSING_CACHE_TTL = 5
+
+# Text artifacts are stored gzip-compressed with Content-Encoding set, so
+# presigned/proxied downloads can be decompressed by the client. The original
+# length is kept in object metadata.
+COMPRESSIBLE_CONTENT_TYPES = {"application/json", "text/markdown"}
+GZIP_LEVEL = 6
+UNCOMPRESSED_SIZE_METADATA = "uncompressed-size"
+
 
 class StorageService:
     """
@@ -46,6 +77,7 @@ class StorageService:
         access_key: Optional[str] = None,
         secret_key: Optional[str] = None,
         use_ssl: Optional[bool] = None,
+        warm_users: Optional[List[str]] = None,
     ):
         """
         Initialize storage service.
@@ -55,12 +87,39 @@ class StorageService:
             access_key: S3 access key
             secret_key: S3 secret key
             use_ssl: Whether to use SSL
+            warm_users: Usernames whose bucket clients are created up front
         """
         self.endpoint_url = endpoint_url or S3_ENDPOINT_URL
         self.access_key = access_key or S3_ACCESS_KEY
         self.secret_key = secret_key or S3_SECRET_KEY
         self.use_ssl = use_ssl if use_ssl is not None else S3_USE_SSL
         self._clients: dict[str, S3Storage] = {}
+        # Raw username -> client, so repeat lookups skip sanitizing and locking
+        self._user_clients: dict[str, S3Storage] = {}
+        self._clients_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=STORAGE_WORKERS)
+        self._cache_lock = threading.Lock()
+        self._transcript_cache = TTLCache(CACHE_MAX_ENTRIES, TRANSCRIPT_CACHE_TTL)
+        self._exists_cache = TTLCache(CACHE_MAX_ENTRIES, EXISTS_CACHE_TTL)
+        self._missing_cache = TTLCache(CACHE_MAX_ENTRIES, MISSING_CACHE_TTL)
+
+        if warm_users:
+            self.warm(warm_users)
+
+    def warm(self, usernames: Iterable[str]) -> None:
+        """
+        Create clients for the given users and make sure their buckets exist,
+        so their first request does not pay for the bucket check.
+        Failures are logged and retried lazily on first use.
+        """
+
+        def _warm(username: str) -> None:
+            try:
+                self._get_user_storage(username)
+            except Exception as e:
+                logger.warning(f"Failed to warm storage for user '{username}': {e}")
+
+        list(self._executor.map(_warm, usernames))
 
     def _sanitize_bucket_name(self, username: str) -> str:
         """
@@ -79,20 +138,30 @@ class StorageService:
     def _get_user_storage(self, username: str) -> S3Storage:
         """
         Get or create S3Storage client for a user's bucket.
+
+        All per-user instances share one boto3 client and connection pool
+        (see object_storage._get_s3_client); only the bucket name differs.
         """
-        bucket_name = self._sanitize_bucket_name(username)
+        storage = self._user_clients.get(username)
+        if storage is not None:
+            return storage
 
-        if bucket_name not in self._clients:
-            logger.debug(f"Creating S3Storage client for bucket '{bucket_name}'")
-            self._clients[bucket_name] = S3Storage(
-                bucket=bucket_name,
-                endpoint_url=self.endpoint_url,
-                access_key=self.access_key,
-                secret_key=self.secret_key,
-                use_ssl=self.use_ssl,
-            )
+        bucket_name = self._sanitize_bucket_name(username)
 
-        return self._clients[bucket_name]
+        # Routes fan requests out over self._executor, so creation must not race
+        with self._clients_lock:
+            if bucket_name not in self._clients:
+                logger.debug(f"Creating S3Storage client for bucket '{bucket_name}'")
+                self._clients[bucket_name] = S3Storage(
+                    bucket=bucket_name,
+                    endpoint_url=self.endpoint_url,
+                    access_key=self.access_key,
+                    secret_key=self.secret_key,
+                    use_ssl=self.use_ssl,
+                )
+            storage = self._clients[bucket_name]
+            self._user_clients[username] = storage
+            return storage
 
     def _get_object_key(
         self,
@@ -115,6 +184,46 @@ class StorageService:
             return f"{project_id}/{artifact_type}/{filename}"
         return f"{project_id}/{artifact_type}/"
 
+    def _invalidate(self, username: str, prefix: str) -> None:
+        """
+        Drop cached transcripts and existence checks for keys under prefix.
+        Pass a full object key to invalidate a single file.
+        """
+        with self._cache_lock:
+            for cache in (self._exists_cache, self._missing_cache):
+                stale = [
+                    k for k in cache if k[0] == username and k[1].startswith(prefix)
+                ]
+                for k in stale:
+                    cache.pop(k, None)
+            stale = [
+                k
+                for k in self._transcript_cache
+                if k[0] == username
+                and self._get_object_key(
+                    k[1], ARTIFACT_TRANSCRIPTS, "transcript.json"
+                ).startswith(prefix)
+            ]
+            for k in stale:
+                self._transcript_cache.pop(k, None)
+
+    def _mark_written(self, username: str, key: str) -> None:
+        """
+        Record a key this process just wrote: stale entries are dropped and the
+        key is remembered as existing, so follow-up file_exists checks in the
+        same pipeline run don't need a HEAD request.
+        """
+        self._invalidate(username, key)
+        with self._cache_lock:
+            self._exists_cache[(username, key)] = True
+
+    def invalidate_transcript(self, username: str, project_id: str) -> None:
+        """Drop the cached transcript for a project."""
+        self._invalidate(
+            username,
+            self._get_object_key(project_id, ARTIFACT_TRANSCRIPTS, "transcript.json"),
+        )
+
     # =========================================================================
     # Upload Methods
     # =========================================================================
@@ -138,6 +247,29 @@ class StorageService:
 
         logger.info(f"Uploading video to '{key}' for user '{username}'")
         storage.write_bytes(key, file_data, content_type=content_type)
+        self._mark_written(username, key)
+        return key
+
+    def upload_video_stream(
+        self,
+        username: str,
+        project_id: str,
+        fileobj: BinaryIO,
+        filename: str = "video.mp4",
+        content_type: str = "video/mp4",
+    ) -> str:
+        """
+        Upload a video from a file-like object without reading it into memory.
+
+        Returns:
+            S3 object key of the uploaded file
+        """
+        storage = self._get_user_storage(username)
+        key = self._get_object_key(project_id, ARTIFACT_VIDEOS, filename)
+
+        logger.info(f"Streaming video upload to '{key}' for user '{username}'")
+        storage.write_fileobj(key, fileobj, content_type=content_type)
+        self._mark_written(username, key)
         return key
 
     def upload_transcript(
@@ -160,7 +292,8 @@ class StorageService:
             data = data.encode("utf-8")
 
         logger.info(f"Uploading transcript to '{key}' for user '{username}'")
-        storage.write_bytes(key, data, content_type="application/json")
+        self._write_text(storage, key, data, "application/json")
+        self._mark_written(username, key)
         return key
 
     def upload_frame(
@@ -182,6 +315,7 @@ class StorageService:
 
         logger.debug(f"Uploading frame to '{key}'")
         storage.write_bytes(key, data, content_type=content_type)
+        self._mark_written(username, key)
         return key
 
     def upload_notes(
@@ -221,9 +355,28 @@ class StorageService:
                 content_type = "application/octet-stream"
 
         logger.info(f"Uploading notes to '{key}' for user '{username}'")
-        storage.write_bytes(key, data, content_type=content_type)
+        self._write_text(storage, key, data, content_type)
+        self._mark_written(username, key)
         return key
 
+    def _write_text(
+        self, storage: S3Storage, key: str, data: bytes, content_type: str
+    ) -> None:
+        """Write data, gzip-compressing it first if the content type is textual."""
+        if content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            storage.write_bytes(key, data, content_type=content_type)
+            return
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        storage.write_bytes(
+            key,
+            compressed,
+            content_type=content_type,
+            extra_args={
+                "ContentEncoding": "gzip",
+                "Metadata": {UNCOMPRESSED_SIZE_METADATA: str(len(data))},
+            },
+        )
+
     def upload_file_from_path(
         self,
         username: str,
@@ -244,6 +397,7 @@ class StorageService:
 
         logger.info(f"Uploading file from '{local_path}' to '{key}'")
         storage.write_file(key, local_path)
+        self._mark_written(username, key)
         return key
 
     # =========================================================================
@@ -257,14 +411,36 @@ class StorageService:
         artifact_type: str,
         filename: str,
         run_id: Optional[str] = None,
-    ) -> bytes:
+    ) -> Union[bytes, bytearray]:
         """
         Download a file from user's storage.
         For notes, if run_id is provided, downloads from notes/{run_id}/ subfolder.
+        Gzip-stored text artifacts are decompressed.
 
         Returns:
             File contents as bytes
         """
+        return self.download_file_encoded(
+            username, project_id, artifact_type, filename, run_id=run_id
+        )[0]
+
+    def download_file_encoded(
+        self,
+        username: str,
+        project_id: str,
+        artifact_type: str,
+        filename: str,
+        run_id: Optional[str] = None,
+        decompress: bool = True,
+    ) -> Tuple[Union[bytes, bytearray], Optional[str]]:
+        """
+        Download a file, optionally keeping it in its stored Content-Encoding.
+        Objects stored with Content-Encoding gzip are decompressed unless
+        decompress=False.
+
+        Returns:
+            (contents, content encoding the contents are still in, or None)
+        """
         storage = self._get_user_storage(username)
 
         # Handle versioned notes
@@ -274,7 +450,34 @@ class StorageService:
             key = self._get_object_key(project_id, artifact_type, filename)
 
         logger.info(f"Downloading file '{key}' for user '{username}'")
-        return storage.read_bytes(key)
+        data, headers = storage.read_object(key)
+        encoding = headers.get("ContentEncoding")
+        if decompress and encoding == "gzip":
+            return gzip.decompress(data), None
+        return data, encoding
+
+    def download_many(
+        self,
+        username: str,
+        project_id: str,
+        artifact_type: str,
+        filenames: Iterable[str],
+        run_id: Optional[str] = None,
+    ) -> Dict[str, bytes]:
+        """
+        Download several files of one artifact type concurrently.
+
+        Returns:
+            Mapping of filename to file contents
+        """
+        filenames = list(filenames)
+        contents = self._executor.map(
+            lambda fn: self.download_file(
+                username, project_id, artifact_type, fn, run_id=run_id
+            ),
+            filenames,
+        )
+        return dict(zip(filenames, contents))
 
     def download_file_to_path(
         self,
@@ -286,6 +489,7 @@ class StorageService:
     ) -> str:
         """
         Download a file to a local path.
+        Gzip-stored text artifacts are written decompressed.
 
         Returns:
             Local file path
@@ -294,7 +498,11 @@ class StorageService:
         key = self._get_object_key(project_id, artifact_type, filename)
 
         logger.info(f"Downloading '{key}' to '{local_path}'")
-        storage.read_file(key, local_path)
+        if storage.head(key).get("ContentEncoding") == "gzip":
+            data, _ = storage.read_object(key)
+            Path(local_path).write_bytes(gzip.decompress(data))
+        else:
+            storage.read_file(key, local_path)
         return local_path
 
     def download_to_temp(
@@ -326,17 +534,28 @@ class StorageService:
         """
         Get transcript content for a project.
 
+        Results are cached for TRANSCRIPT_CACHE_TTL seconds.
+
         Returns:
             Transcript bytes or None if not found
         """
+        with self._cache_lock:
+            cached = self._transcript_cache.get((username, project_id))
+        if cached is not None:
+            return cached
+
         try:
-            return self.download_file(
+            data = self.download_file(
                 username, project_id, ARTIFACT_TRANSCRIPTS, "transcript.json"
             )
         except Exception as e:
             logger.warning(f"Transcript not found for project '{project_id}': {e}")
             return None
 
+        with self._cache_lock:
+            self._transcript_cache[(username, project_id)] = data
+        return data
+
     # =========================================================================
     # File Operations
     # =========================================================================
@@ -349,7 +568,10 @@ class StorageService:
         filename: str,
         run_id: Optional[str] = None,
     ) -> bool:
-        """Check if a file exists in user's storage."""
+        """
+        Check if a file exists in user's storage.
+        Hits are cached for EXISTS_CACHE_TTL seconds, misses for MISSING_CACHE_TTL.
+        """
         storage = self._get_user_storage(username)
 
         # Handle versioned notes
@@ -358,7 +580,18 @@ class StorageService:
         else:
             key = self._get_object_key(project_id, artifact_type, filename)
 
-        return storage.exists(key)
+        cache_key = (username, key)
+        with self._cache_lock:
+            if cache_key in self._exists_cache:
+                return True
+            if cache_key in self._missing_cache:
+                return False
+
+        exists = storage.exists(key)
+        with self._cache_lock:
+            cache = self._exists_cache if exists else self._missing_cache
+            cache[cache_key] = exists
+        return exists
 
     def list_files(
         self,
@@ -372,11 +605,17 @@ class StorageService:
         Returns:
             List of filenames (not full keys)
         """
-        storage = self._get_user_storage(username)
         prefix = self._get_object_key(project_id, artifact_type)
+        return self._list_filenames(username, prefix)
+
+    def _list_filenames(
+        self, username: str, prefix: str, recursive: bool = True
+    ) -> List[str]:
+        """List keys under prefix with the prefix stripped off."""
+        storage = self._get_user_storage(username)
 
         files = []
-        for key in storage.list_files(prefix):
+        for key in storage.list_files(prefix, recursive=recursive):
             # Extract just the filename from the full key
             filename = key.replace(prefix, "").lstrip("/")
             if filename:
@@ -384,6 +623,65 @@ class StorageService:
 
         return files
 
+    def list_all_files(
+        self,
+        username: str,
+        project_id: str,
+        artifact_types: Iterable[str] = VALID_ARTIFACT_TYPES,
+    ) -> Dict[str, List[str]]:
+        """
+        List files for several artifact types concurrently.
+
+        Returns:
+            Mapping of artifact type to its list of filenames
+        """
+        artifact_types = list(artifact_types)
+        results = self._executor.map(
+            lambda at: self.list_files(username, project_id, at), artifact_types
+        )
+        return dict(zip(artifact_types, results))
+
+    def copy_notes(
+        self,
+        username: str,
+        project_id: str,
+        src_run_id: str,
+        dst_run_id: str,
+        filename: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Copy notes from one run folder to another with server-side copies,
+        so no file content passes through the backend.
+        If filename is None, every file in the source run is copied, using the
+        sizes from the listing so small files need no HEAD request.
+
+        Returns:
+            List of destination S3 object keys
+        """
+        storage = self._get_user_storage(username)
+        src_prefix = f"{project_id}/{ARTIFACT_NOTES}/{src_run_id}/"
+        dst_prefix = f"{project_id}/{ARTIFACT_NOTES}/{dst_run_id}/"
+        if filename:
+            sizes = {filename: None}
+        else:
+            sizes = {
+                key[len(src_prefix) :]: size
+                for key, size in storage.list_file_sizes(src_prefix)
+                if key != src_prefix
+            }
+
+        def _copy(name: str) -> str:
+            storage.copy(src_prefix + name, dst_prefix + name, size=sizes[name])
+            return dst_prefix + name
+
+        keys = list(self._executor.map(_copy, sizes))
+        for key in keys:
+            self._mark_written(username, key)
+        logger.info(
+            f"Copied {len(keys)} notes files from run '{src_run_id}' to '{dst_run_id}'"
+        )
+        return keys
+
     def delete_file(
         self,
         username: str,
@@ -396,6 +694,7 @@ class StorageService:
             storage = self._get_user_storage(username)
             key = self._get_object_key(project_id, artifact_type, filename)
             storage.delete_file(key)
+            self._invalidate(username, key)
             return True
         except Exception as e:
             logger.error(f"Failed to delete file '{filename}': {e}")
@@ -415,7 +714,28 @@ class StorageService:
         """
         storage = self._get_user_storage(username)
         prefix = self._get_object_key(project_id, artifact_type)
-        return storage.delete_prefix(prefix)
+        count = storage.delete_prefix(prefix)
+        self._invalidate(username, prefix)
+        return count
+
+    def delete_artifact_types(
+        self,
+        username: str,
+        project_id: str,
+        artifact_types: Iterable[str],
+    ) -> Dict[str, int]:
+        """
+        Delete several artifact types for a project concurrently.
+
+        Returns:
+            Mapping of artifact type to number of files deleted
+        """
+        artifact_types = list(artifact_types)
+        counts = self._executor.map(
+            lambda at: self.delete_artifact_type(username, project_id, at),
+            artifact_types,
+        )
+        return dict(zip(artifact_types, counts))
 
     def delete_project_artifacts(
         self,
@@ -429,8 +749,11 @@ class StorageService:
             Total number of files deleted
         """
         storage = self._get_user_storage(username)
-        prefix = f"{project_id}/"
-        count = storage.delete_prefix(prefix)
+        # Artifact folders are listed and deleted in parallel; the final pass
+        # sweeps anything left directly under the project prefix
+        counts = self.delete_artifact_types(username, project_id, VALID_ARTIFACT_TYPES)
+        count = sum(counts.values()) + storage.delete_prefix(f"{project_id}/")
+        self._invalidate(username, f"{project_id}/")
         logger.info(f"Deleted {count} files for project '{project_id}'")
         return count
 
@@ -446,6 +769,8 @@ class StorageService:
     ) -> int:
         """
         Get total size in bytes of all files in an artifact type folder.
+        Sizes come from the listing, so gzip-stored text artifacts count with
+        their stored (compressed) size.
 
         Returns:
             Total size in bytes
@@ -471,6 +796,25 @@ class StorageService:
             logger.error(f"Failed to get artifact size for '{artifact_type}': {e}")
             return 0
 
+    def get_artifact_sizes(
+        self,
+        username: str,
+        project_id: str,
+        artifact_types: Iterable[str] = VALID_ARTIFACT_TYPES,
+    ) -> Dict[str, int]:
+        """
+        Get total size in bytes for several artifact types concurrently.
+
+        Returns:
+            Mapping of artifact type to total size in bytes
+        """
+        artifact_types = list(artifact_types)
+        sizes = self._executor.map(
+            lambda at: self.get_artifact_size(username, project_id, at),
+            artifact_types,
+        )
+        return dict(zip(artifact_types, sizes))
+
     # =========================================================================
     # Notes File Status
     # =========================================================================
@@ -484,46 +828,43 @@ class StorageService:
         """
         Check which notes files exist for a project/run.
 
+        Uses a single listing of the notes folder rather than one HEAD
+        request per file.
+
         Returns:
             Dictionary with boolean status for each notes file
         """
-        return {
-            "final_notes_md": self.file_exists(
-                username, project_id, ARTIFACT_NOTES, "final_notes.md", run_id
-            ),
-            "final_notes_pdf": self.file_exists(
-                username, project_id, ARTIFACT_NOTES, "final_notes.pdf", run_id
-            ),
-            "summary_md": self.file_exists(
-                username, project_id, ARTIFACT_NOTES, "summary.md", run_id
-            ),
-            "summary_pdf": self.file_exists(
-                username, project_id, ARTIFACT_NOTES, "summary.pdf", run_id
-            ),
-        }
+        prefix = self._get_object_key(project_id, ARTIFACT_NOTES)
+        if run_id:
+            prefix = f"{prefix}{run_id}/"
+        return _notes_status(self._list_filenames(username, prefix, recursive=False))
 
     def list_run_notes(
         self,
         username: str,
         project_id: str,
         run_id: str,
-    ) -> List[str]:
+        include_status: bool = False,
+    ) -> Union[List[str], Tuple[List[str], Dict[str, bool]]]:
         """
         List all notes files for a specific run.
+        With include_status=True, the get_notes_files_status dictionary is
+        derived from the same listing and returned alongside.
 
         Returns:
-            List of filenames in the run's notes folder
+            List of filenames in the run's notes folder, or (files, status)
         """
-        storage = self._get_user_storage(username)
         prefix = f"{project_id}/{ARTIFACT_NOTES}/{run_id}/"
+        files = self._list_filenames(username, prefix)
+        if include_status:
+            return files, _notes_status(files)
+        return files
 
-        files = []
-        for key in storage.list_files(prefix):
-            filename = key.replace(prefix, "").lstrip("/")
-            if filename:
-                files.append(filename)
 
-        return files
+def _notes_status(filenames: Iterable[str]) -> Dict[str, bool]:
+    """Map each of NOTES_STATUS_FILES to whether it is among filenames."""
+    present = set(filenames)
+    return {fn.replace(".", "_"): fn in present for fn in NOTES_STATUS_FILES}
 
 
 # Global instance for convenience
@@ -534,5 +875,5 @@ def get_storage_service() -> StorageService:
     """Get the global storage service instance."""
     global _storage_service
     if _storage_service is None:
-        _storage_service = StorageService()
+        _storage_service = StorageService(warm_users=S3_WARM_USERS)
     return _storage_service
@@ -1,46 +1,70 @@
-from datetime import datetime
+import re
+
+_BLANK_LINE_RE = re.compile(r"\n\s*\n")
+# VTT cue timing line; hours are optional and cue settings may follow the end time
+_TIMING_RE = re.compile(
+    r"(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})\s+-->\s+"
+    r"(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})"
+)
+
+
+def _timing_to_srt(hours, minutes, seconds, millis):
+    return f"{int(hours or 0):02d}:{minutes}:{seconds},{millis}"
+
+
+def _timing_to_seconds(hours, minutes, seconds, millis):
+    total = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    return (total * 1000 + int(millis)) / 1000
 
 
 def vtt_to_srt(vtt_content):
-    srt_content = ""
+    parts: list[str] = []
     lines = vtt_content.splitlines()
     index = 1
     i = 0
 
     while i < len(lines):
-        line = lines[i].strip()
-        if "-->" in line:
-            start_time, end_time = line.split(" --> ")
-            start_time = start_time.replace(".", ",")
-            end_time = end_time.replace(".", ",")
-            srt_content += f"{index}\n{start_time} --> {end_time}\n"
+        line = lines[i]
+        # The substring test is cheaper than the regex on the many text lines
+        match = "-->" in line and _TIMING_RE.match(line.strip())
+        if match:
+            start_time = _timing_to_srt(*match.group(1, 2, 3, 4))
+            end_time = _timing_to_srt(*match.group(5, 6, 7, 8))
+            parts.append(f"{index}\n{start_time} --> {end_time}\n")
             index += 1
             i += 1
             while i < len(lines) and lines[i].strip() != "":
-                srt_content += lines[i] + "\n"
+                parts.append(lines[i] + "\n")
                 i += 1
-            srt_content += "\n"
+            parts.append("\n")
         i += 1
 
-    return srt_content
+    return "".join(parts)
+
+
+def _parse_timestamp(timestamp):
+    """Convert an ``HH:MM:SS,mmm`` timestamp to seconds."""
+    hours, minutes, rest = timestamp.split(":")
+    seconds, fraction = rest.split(",")
+    # Integer microseconds keep the result identical to timedelta.total_seconds()
+    micros = (int(hours) * 3600 + int(minutes) * 60 + int(seconds)) * 1_000_000
+    micros += int(fraction.ljust(6, "0")[:6])
+    return micros / 1_000_000
 
 
 def srt_to_youtube_json(srt_content):
-    entries = srt_content.strip().split("\n\n")
+    entries = _BLANK_LINE_RE.split(srt_content.strip())
     transcript = []
 
     for entry in entries:
-        lines = entry.split("\n")
+        lines = entry.split("\n", 2)
         if len(lines) >= 3:
             time_range = lines[1]
-            text = " ".join(lines[2:])
+            text = lines[2].replace("\n", " ")
 
             start_str, end_str = time_range.split(" --> ")
-            start_time = datetime.strptime(start_str, "%H:%M:%S,%f")
-            end_time = datetime.strptime(end_str, "%H:%M:%S,%f")
-
-            start_seconds = (start_time - datetime(1900, 1, 1)).total_seconds()
-            end_seconds = (end_time - datetime(1900, 1, 1)).total_seconds()
+            start_seconds = _parse_timestamp(start_str)
+            end_seconds = _parse_timestamp(end_str)
 
             transcript.append(
                 {
@@ -54,6 +78,31 @@ def srt_to_youtube_json(srt_content):
 
 
 def vtt_to_youtube_json(vtt_content):
-    srt_content = vtt_to_srt(vtt_content)
-    youtube_json = srt_to_youtube_json(srt_content)
-    return youtube_json
+    # Single pass over the VTT cues; no intermediate SRT string is built
+    lines = vtt_content.splitlines()
+    transcript = []
+    i = 0
+
+    while i < len(lines):
+        line = lines[i]
+        # The substring test is cheaper than the regex on the many text lines
+        match = "-->" in line and _TIMING_RE.match(line.strip())
+        if match:
+            start_seconds = _timing_to_seconds(*match.group(1, 2, 3, 4))
+            end_seconds = _timing_to_seconds(*match.group(5, 6, 7, 8))
+            i += 1
+            text_lines = []
+            while i < len(lines) and lines[i].strip() != "":
+                text_lines.append(lines[i])
+                i += 1
+            if text_lines:
+                transcript.append(
+                    {
+                        "text": " ".join(text_lines),
+                        "start": start_seconds,
+                        "duration": round(end_seconds - start_seconds, 3),
+                    }
+                )
+        i += 1
+
+    return transcript
@@ -7,7 +7,11 @@ from dotenv import load_dotenv
 import os
 import sys
 from app.services.auth import create_user
-from app.services.database.user_database import ROLE_ADMIN, list_all_users
+from app.services.database.user_database import (
+    ROLE_ADMIN,
+    get_user_from_db,
+    list_admin_usernames,
+)
 from app.utils import create_simple_logger
 
 logger = create_simple_logger(__name__)
@@ -33,12 +37,10 @@ def setup_admin_user() -> int:
 
     try:
         # Check if admin users already exist
-        users = list_all_users()
-        admin_users = [u for u in users if u.get("role") == ROLE_ADMIN]
+        admin_names = list_admin_usernames()
 
-        if admin_users:
-            admin_count = len(admin_users)
-            admin_names = [u.get("username") for u in admin_users]
+        if admin_names:
+            admin_count = len(admin_names)
             logger.info(
                 f"✅ Admin user(s) already exist: {', '.join(admin_names)} (total: {admin_count})"
             )
@@ -47,9 +49,7 @@ def setup_admin_user() -> int:
             return 0
 
         # Check if the specific admin user exists (by username)
-        existing_user = next(
-            (u for u in users if u.get("username") == admin_username), None
-        )
+        existing_user = get_user_from_db(admin_username)
 
         if existing_user:
             logger.info(f"✅ User '{admin_username}' already exists")
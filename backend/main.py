@@ -1,13 +1,28 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.env import CORS_ORIGINS, S3_WARM_USERS
 from app.routes import register_routes
+from app.services.storage_service import get_storage_service
 from app.setup_admin_user import setup_admin_user
 from app.utils import create_simple_logger
 
 logger = create_simple_logger(__name__)
 
+# How long shutdown waits for a still-running admin setup before cancelling it
+ADMIN_SETUP_SHUTDOWN_TIMEOUT = 5
+
+
+def _setup_admin_user_safely() -> None:
+    """Run admin user setup, logging instead of raising on failure."""
+    try:
+        setup_admin_user()
+    except Exception as e:
+        logger.error(f"Failed to setup admin user: {e}")
+        # We don't stop the app, but we log the error
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -17,26 +32,43 @@ async def lifespan(app: FastAPI):
     """
     logger.info("🚀 Application starting up...")
 
-    # Run admin user setup
-    try:
-        setup_admin_user()
-    except Exception as e:
-        logger.error(f"Failed to setup admin user: {e}")
-        # We don't stop the app, but we log the error
+    # Run admin user setup in the background so a slow database doesn't keep
+    # the server (and its health check) from accepting connections
+    admin_setup = asyncio.create_task(asyncio.to_thread(_setup_admin_user_safely))
+
+    # Prepare configured user buckets before the first request
+    if S3_WARM_USERS:
+        get_storage_service()
 
     yield
 
     logger.info("🛑 Application shutting down...")
+    if not admin_setup.done():
+        try:
+            await asyncio.wait_for(admin_setup, timeout=ADMIN_SETUP_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Admin user setup did not finish before shutdown")
 
 
 app = FastAPI(title="VidScribe API", version="0.1.0", lifespan=lifespan)
 
-# Allow access from typical local dev origins. Adjust as needed.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # For dev; narrow this for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Allowed origins come from CORS_ORIGINS. With an explicit list, Starlette
+# matches origins by set lookup and sends a precomputed header list instead of
+# echoing every requested header back.
+if "*" in CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+else:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        allow_headers=["Authorization", "Content-Type", "Accept"],
+    )
 register_routes(app)
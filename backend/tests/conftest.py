@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+# Make the ``app`` package importable when pytest runs from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MINIO_ENDPOINT = "http://minio.test:9000"
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+# Let moto answer requests sent to the fake MinIO endpoint
+os.environ.setdefault("MOTO_S3_CUSTOM_ENDPOINTS", MINIO_ENDPOINT)
+
+
+@pytest.fixture
+def mock_s3():
+    moto = pytest.importorskip("moto")
+    from app.services.object_storage import S3Storage
+
+    # Buckets verified against a previous mock no longer exist
+    S3Storage._verified_buckets.clear()
+    with moto.mock_aws():
+        yield
+
+
+@pytest.fixture
+def s3_storage(mock_s3):
+    from app.services.object_storage import S3Storage
+
+    return S3Storage(bucket="test-bucket", endpoint_url=MINIO_ENDPOINT, use_ssl=False)
+
+
+@pytest.fixture
+def storage_service(mock_s3):
+    from app.services.storage_service import StorageService
+
+    return StorageService(endpoint_url=MINIO_ENDPOINT, use_ssl=False)
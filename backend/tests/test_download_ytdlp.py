@@ -0,0 +1,182 @@
+import os
+import shutil
+
+import pytest
+
+from app.services import download_ytdlp
+from app.services.download_ytdlp import (
+    DownloadResult,
+    _download_from_probe,
+    download_media,
+)
+
+
+class _FakeYoutubeDL:
+    """Stands in for yt_dlp.YoutubeDL: reports progress and writes the file."""
+
+    progress_steps = 200
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        return {"id": "abc123", "title": "A: Title", "ext": "mp4"}
+
+    def prepare_filename(self, info):
+        name = self.opts["outtmpl"] % {
+            "id": info["id"],
+            "title": info["title"].replace(":", "_").replace(" ", "_"),
+            "ext": info["ext"],
+        }
+        return os.path.join(self.opts["paths"]["home"], name)
+
+    def process_ie_result(self, info, download=True):
+        path = os.path.splitext(self.prepare_filename(info))[0] + ".mp4"
+        hooks = self.opts["progress_hooks"]
+        for i in range(1, self.progress_steps + 1):
+            for hook in hooks:
+                hook(
+                    {
+                        "status": "downloading",
+                        "filename": path,
+                        "downloaded_bytes": i,
+                        "total_bytes": self.progress_steps,
+                    }
+                )
+        with open(path, "wb") as f:
+            f.write(b"video")
+        for hook in hooks:
+            hook({"status": "finished", "filename": path, "info_dict": info})
+        return info
+
+
+@pytest.fixture
+def fake_ytdl(monkeypatch):
+    monkeypatch.setattr(download_ytdlp.yt_dlp, "YoutubeDL", _FakeYoutubeDL)
+
+
+def test_progress_events_are_coalesced(fake_ytdl, tmp_path):
+    events = []
+    result = download_media(
+        "abc123", output_dir=str(tmp_path), progress_callback=events.append
+    )
+
+    assert result["status"] == "success"
+    downloading = [e for e in events if e["status"] == "downloading"]
+    # A tight loop of updates collapses to the first one plus the latest
+    assert 1 <= len(downloading) < _FakeYoutubeDL.progress_steps
+    assert downloading[-1]["downloaded_bytes"] == _FakeYoutubeDL.progress_steps
+    statuses = [e["status"] for e in events]
+    assert statuses.index("finished") > statuses.index("downloading")
+    assert statuses[-1] == "success"
+
+
+def test_title_filenames_by_default(fake_ytdl, tmp_path):
+    result = download_media("abc123", output_dir=str(tmp_path))
+    assert [os.path.basename(f) for f in result["downloaded_files"]] == ["A__Title.mp4"]
+
+
+def test_id_filenames_when_requested(fake_ytdl, tmp_path):
+    result = download_media("abc123", output_dir=str(tmp_path), use_id_filenames=True)
+    assert [os.path.basename(f) for f in result["downloaded_files"]] == ["abc123.mp4"]
+
+    # Already downloaded: the expected ID-based path is found without re-downloading
+    again = download_media("abc123", output_dir=str(tmp_path), use_id_filenames=True)
+    assert again["status"] == "skipped"
+    assert again["downloaded_files"] == result["downloaded_files"]
+
+
+def test_explicit_template_wins_over_id_filenames(fake_ytdl, tmp_path):
+    result = download_media(
+        "abc123",
+        output_dir=str(tmp_path),
+        filename_template="clip-%(id)s.%(ext)s",
+        use_id_filenames=True,
+    )
+    assert [os.path.basename(f) for f in result["downloaded_files"]] == [
+        "clip-abc123.mp4"
+    ]
+
+
+def test_output_dir_is_recreated_after_deletion(fake_ytdl, tmp_path):
+    first = download_media("abc123", output_dir=str(tmp_path))
+    shutil.rmtree(first["output_dir"])
+
+    second = download_media("abc123", output_dir=str(tmp_path))
+    assert second["status"] == "success"
+    assert os.path.exists(second["downloaded_files"][0])
+
+
+def test_download_result_to_dict_omits_unset_optional_fields(tmp_path):
+    result = DownloadResult(
+        status="unknown",
+        url="https://www.youtube.com/watch?v=abc123",
+        output_dir="relative/dir",
+        audio_only=False,
+        video_only=True,
+        resolution=720,
+    )
+    assert result.to_dict() == {
+        "status": "unknown",
+        "url": "https://www.youtube.com/watch?v=abc123",
+        "output_dir": os.path.abspath("relative/dir"),
+        "audio_only": False,
+        "video_only": True,
+        "resolution": 720,
+        "downloaded_files": [],
+    }
+
+    result.update({"status": "error", "error": "boom", "count": 0})
+    data = result.to_dict()
+    assert (data["status"], data["error"], data["count"]) == ("error", "boom", 0)
+    assert "titles" not in data
+
+
+def test_download_result_rejects_unknown_fields():
+    result = DownloadResult(
+        status="unknown",
+        url=None,
+        output_dir=".",
+        audio_only=False,
+        video_only=False,
+        resolution=None,
+    )
+    with pytest.raises(AttributeError):
+        result.update({"not_a_field": 1})
+
+
+def test_download_media_error_result(monkeypatch, tmp_path):
+    class _FailingYoutubeDL(_FakeYoutubeDL):
+        def extract_info(self, url, download=False):
+            raise download_ytdlp.yt_dlp.utils.DownloadError("unavailable")
+
+    monkeypatch.setattr(download_ytdlp.yt_dlp, "YoutubeDL", _FailingYoutubeDL)
+    result = download_media("abc123", output_dir=str(tmp_path))
+    assert result["status"] == "error"
+    assert "unavailable" in result["error"]
+    assert result["downloaded_files"] == []
+    assert result["output_dir"] == os.path.join(str(tmp_path), "abc123")
+
+
+def test_download_from_probe_falls_back_on_download_error():
+    calls = []
+
+    class _ExpiredYoutubeDL(_FakeYoutubeDL):
+        def process_ie_result(self, info, download=True):
+            raise download_ytdlp.yt_dlp.utils.DownloadError("HTTP Error 403")
+
+        def extract_info(self, url, download=False):
+            calls.append((url, download))
+            return {"id": "abc123", "title": "fresh", "ext": "mp4"}
+
+    ydl = _ExpiredYoutubeDL({})
+    info = _download_from_probe(ydl, "https://youtu.be/abc123", {"id": "abc123"})
+
+    assert calls == [("https://youtu.be/abc123", True)]
+    assert info["title"] == "fresh"
@@ -0,0 +1,22 @@
+import pytest
+
+from app.routes.downloads import _accepts_gzip
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("*", True),
+        ("", False),
+        ("identity", False),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, deflate", False),
+        ("*;q=0", False),
+        ("gzip;q=0, *", False),
+        ("deflate, *;q=0.5", True),
+    ],
+)
+def test_accepts_gzip_honours_qvalues(header, expected):
+    assert _accepts_gzip(header) is expected
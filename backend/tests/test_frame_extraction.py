@@ -0,0 +1,164 @@
+import asyncio
+import io
+import shutil
+import sys
+
+import ffmpeg
+import pytest
+from PIL import Image, ImageChops
+
+from app.services import frame_extraction
+from app.services.frame_extraction import (
+    _group_timestamps,
+    aextract_frames,
+    add_duration_to_timestamp,
+    add_duration_to_timestamps_batch,
+    extract_frame_bytes,
+    extract_frames_batch,
+)
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+)
+SHAPE = (120, 160)
+
+
+@pytest.fixture
+def vfr_video(tmp_path, monkeypatch):
+    """A 40 s test video whose frame intervals grow over time."""
+    path = tmp_path / "project" / "video.mp4"
+    path.parent.mkdir()
+    (
+        ffmpeg.input("testsrc2=size=160x120:rate=10:duration=30", f="lavfi")
+        .filter("setpts", "(N+N*N/900)/10/TB")
+        .output(str(path), fps_mode="passthrough", g=100, pix_fmt="yuv420p")
+        .run(quiet=True, overwrite_output=True)
+    )
+    # Keep the test independent of ffprobe
+    monkeypatch.setattr(frame_extraction, "_get_video_duration", lambda _: 40.0)
+    return str(path)
+
+
+def _seek_frame(video_path: str, seconds: int) -> Image.Image:
+    """The frame a plain ``ffmpeg -ss`` seek returns for ``seconds``."""
+    jpeg, _ = (
+        ffmpeg.input(video_path, ss=seconds)
+        .output(
+            "pipe:",
+            vframes=1,
+            vf=f"scale={SHAPE[1]}:{SHAPE[0]}",
+            **frame_extraction.PIPE_OUTPUT_OPTIONS,
+        )
+        .run(capture_stdout=True, quiet=True)
+    )
+    return Image.open(io.BytesIO(jpeg))
+
+
+def test_group_timestamps_caps_each_group_span():
+    # Neighbours are never more than 3 s apart, but no group spans over 4 s
+    items = [(5, "a"), (7, "b"), (9, "c"), (12, "d"), (14, "e"), (40, "f")]
+    assert _group_timestamps(items, 4) == [
+        [(5, "a"), (7, "b"), (9, "c")],
+        [(12, "d"), (14, "e")],
+        [(40, "f")],
+    ]
+
+
+@pytest.mark.parametrize("quantities", [90, [0, 59, 3600]])
+def test_add_duration_batch_matches_scalar(quantities):
+    timestamps = ["00:00:00", "00:59:30", "01:02:03"]
+    per_item = quantities if isinstance(quantities, list) else [quantities] * 3
+    assert add_duration_to_timestamps_batch(timestamps, quantities, "seconds") == [
+        add_duration_to_timestamp(ts, q, "seconds")
+        for ts, q in zip(timestamps, per_item)
+    ]
+
+
+def test_add_duration_batch_rejects_malformed_timestamps():
+    timestamps = ["01:02", "03:04", "05:06"]
+    with pytest.raises(ValueError):
+        add_duration_to_timestamp(timestamps[0], 5, "seconds")
+    with pytest.raises(ValueError):
+        add_duration_to_timestamps_batch(timestamps, 5, "seconds")
+
+
+@requires_ffmpeg
+def test_batch_matches_single_seek_on_vfr_source(vfr_video, tmp_path):
+    timestamps = ["00:00:02", "00:00:09", "00:00:10", "00:00:18", "00:00:41"]
+    paths = extract_frames_batch(
+        vfr_video,
+        timestamps,
+        output_dir=str(tmp_path / "frames"),
+        image_shape=SHAPE,
+        video_id="vid",
+        max_span=10,
+    )
+
+    # Past the video duration
+    assert "00:00:41" not in paths
+    for timestamp in timestamps[:-1]:
+        seconds = frame_extraction._timestamp_to_seconds(timestamp)
+        frame = Image.open(paths[timestamp])
+        assert frame.size == (SHAPE[1], SHAPE[0])
+        diff = ImageChops.difference(frame, _seek_frame(vfr_video, seconds))
+        assert diff.getbbox() is None, timestamp
+
+
+@requires_ffmpeg
+def test_single_and_batch_paths_agree(vfr_video, tmp_path):
+    timestamps = ["00:00:03", "00:00:04", "00:00:27"]
+    paths = extract_frames_batch(
+        vfr_video,
+        timestamps,
+        output_dir=str(tmp_path / "frames"),
+        image_shape=SHAPE,
+        video_id="vid",
+        max_span=5,
+    )
+    for timestamp in timestamps:
+        single = Image.open(
+            io.BytesIO(extract_frame_bytes(vfr_video, timestamp, image_shape=SHAPE))
+        )
+        diff = ImageChops.difference(Image.open(paths[timestamp]), single)
+        assert diff.getbbox() is None, timestamp
+
+    # Nothing is written next to the source video
+    assert sorted(p.name for p in (tmp_path / "project").iterdir()) == ["video.mp4"]
+
+
+@requires_ffmpeg
+def test_inexact_extraction_returns_a_frame(vfr_video):
+    jpeg = extract_frame_bytes(vfr_video, "00:00:15", image_shape=SHAPE, exact=False)
+    assert Image.open(io.BytesIO(jpeg)).size == (SHAPE[1], SHAPE[0])
+
+
+def test_stopping_aextract_frames_kills_running_ffmpeg(monkeypatch):
+    procs = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    class _SlowStream:
+        def compile(self):
+            return [sys.executable, "-c", "import time; time.sleep(30)"]
+
+    async def recording_exec(*args, **kwargs):
+        proc = await create_subprocess_exec(*args, **kwargs)
+        procs.append(proc)
+        return proc
+
+    monkeypatch.setattr(
+        frame_extraction, "_frame_stream", lambda *a, **k: _SlowStream()
+    )
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", recording_exec)
+
+    async def run():
+        frames = aextract_frames("video.mp4", ["00:00:01", "00:00:02"])
+        consumer = asyncio.ensure_future(frames.__anext__())
+        while not procs:
+            await asyncio.sleep(0.01)
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        await frames.aclose()
+
+    asyncio.run(run())
+    assert len(procs) == 1
+    assert procs[0].returncode is not None
@@ -0,0 +1,37 @@
+import asyncio
+
+from langchain_core.messages import AIMessageChunk, HumanMessage
+
+from app.services import llm
+
+
+class _FakeStreamingLLM:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def astream(self, messages):
+        for chunk in self._chunks:
+            yield AIMessageChunk(content=chunk)
+
+
+def _collect(monkeypatch, chunks):
+    monkeypatch.setattr(
+        llm, "create_llm_instance", lambda **kwargs: _FakeStreamingLLM(chunks)
+    )
+
+    async def run():
+        return [
+            text async for text in llm.atext_completion_stream([HumanMessage("hi")])
+        ]
+
+    return asyncio.run(run())
+
+
+def test_stream_yields_deltas_that_share_a_prefix(monkeypatch):
+    # The second delta starting with the first must not be treated as cumulative
+    chunks = ["*", "**Bold**", " text", "\n", "\n\n", "done"]
+    assert _collect(monkeypatch, chunks) == chunks
+
+
+def test_stream_skips_empty_chunks(monkeypatch):
+    assert _collect(monkeypatch, ["a", "", "b"]) == ["a", "b"]
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from app.services.markdown_embedder import DEFAULT_PREAMBLE
+from app.services.markdown_to_pdf import _embed_source, _pandoc_command
+
+
+def test_tectonic_command_enables_shell_escape_for_default_preamble():
+    # The default preamble loads minted, which only compiles with shell escape
+    assert r"\usepackage{minted}" in DEFAULT_PREAMBLE
+    source = f"---\n{DEFAULT_PREAMBLE}\n---\n\n# Title\n".encode("utf-8")
+
+    cmd = _pandoc_command(source, Path("out.pdf"), engine="tectonic")
+
+    assert "--pdf-engine=tectonic" in cmd
+    assert "--pdf-engine-opt=-Zshell-escape" in cmd
+    assert "--pdf-engine-opt=-shell-escape" not in cmd
+
+
+def test_weasyprint_command_has_no_latex_options():
+    cmd = _pandoc_command(b"# Title\n", Path("out.pdf"), engine="weasyprint")
+
+    assert not any(arg.startswith("--pdf-engine-opt") for arg in cmd)
+
+
+def test_kept_embedded_markdown_has_a_stable_name(tmp_path):
+    md_path = tmp_path / "notes.md"
+    md_path.write_text("# Notes\n", encoding="utf-8")
+
+    first = _embed_source(md_path, preamble=None, keep_file=True)
+    second = _embed_source(md_path, preamble=None, keep_file=True)
+
+    assert first == second == tmp_path / "notes.embedded.md"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "notes.embedded.md",
+        "notes.md",
+    ]
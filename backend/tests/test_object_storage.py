@@ -0,0 +1,140 @@
+import datetime
+import gzip
+import importlib
+
+import botocore.auth
+import pytest
+from s3transfer.manager import TransferManager
+
+from app.services import object_storage
+from app.services.object_storage import S3Storage, _default_transfer_client
+
+from conftest import MINIO_ENDPOINT
+
+
+def test_crt_is_only_chosen_for_aws(monkeypatch):
+    monkeypatch.setattr(object_storage, "HAS_CRT", True)
+    assert _default_transfer_client(None, None) == "crt"
+    assert _default_transfer_client(MINIO_ENDPOINT, None) == "classic"
+    assert _default_transfer_client(None, False) == "classic"
+
+
+def test_custom_endpoint_builds_classic_transfer_manager(monkeypatch, mock_s3):
+    monkeypatch.setattr(object_storage, "HAS_CRT", True)
+    storage = S3Storage(bucket="crt-check", endpoint_url=MINIO_ENDPOINT, use_ssl=False)
+    assert storage.transfer_cfg.preferred_transfer_client == "classic"
+    assert type(storage.transfer_manager) is TransferManager
+
+
+def test_file_round_trip_through_custom_endpoint(s3_storage, tmp_path):
+    src = tmp_path / "video.mp4"
+    src.write_bytes(b"\x00video" * 1000)
+    s3_storage.write_file("u/video.mp4", str(src))
+    with open(src, "rb") as f:
+        s3_storage.write_fileobj("u/stream.mp4", f, content_type="video/mp4")
+
+    dst = tmp_path / "out.mp4"
+    s3_storage.read_file("u/video.mp4", str(dst))
+    assert dst.read_bytes() == src.read_bytes()
+    assert s3_storage.read_bytes("u/stream.mp4") == src.read_bytes()
+
+
+def _count_heads(storage, monkeypatch):
+    calls = []
+    head_object = storage.client.head_object
+
+    def counting_head_object(**kwargs):
+        calls.append(kwargs["Key"])
+        return head_object(**kwargs)
+
+    monkeypatch.setattr(storage.client, "head_object", counting_head_object)
+    return calls
+
+
+def test_copy_with_known_small_size_skips_head(s3_storage, monkeypatch):
+    s3_storage.write_bytes("src.txt", b"hello")
+    heads = _count_heads(s3_storage, monkeypatch)
+
+    s3_storage.copy("src.txt", "dst.txt", size=5)
+    assert heads == []
+    assert s3_storage.read_bytes("dst.txt") == b"hello"
+
+    s3_storage.copy("src.txt", "dst2.txt")
+    assert heads == ["src.txt"]
+
+
+def test_multipart_copy_keeps_encoding_and_metadata(s3_storage):
+    data = gzip.compress(b"x" * 100_000)
+    s3_storage.write_bytes(
+        "notes.md",
+        data,
+        content_type="text/markdown",
+        extra_args={"ContentEncoding": "gzip", "Metadata": {"uncompressed-size": "1"}},
+    )
+
+    s3_storage.copy(
+        "notes.md", "copy.md", force_multipart=True, part_size=5 * 1024 * 1024
+    )
+    head = s3_storage.head("copy.md")
+    assert head["ContentEncoding"] == "gzip"
+    assert head["ContentType"] == "text/markdown"
+    assert head["Metadata"] == {"uncompressed-size": "1"}
+    assert s3_storage.read_bytes("copy.md") == data
+
+
+def test_forced_multipart_copy_of_empty_object(s3_storage):
+    s3_storage.write_bytes("empty.txt", b"")
+    s3_storage.copy("empty.txt", "empty-copy.txt", force_multipart=True)
+    assert s3_storage.read_bytes("empty-copy.txt") == b""
+
+
+def _frozen_now(remove_tzinfo=True):
+    now = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    return now.replace(tzinfo=None) if remove_tzinfo else now
+
+
+def _signing_modules():
+    """botocore modules that timestamp signatures (CRT signers when installed)."""
+    modules = [botocore.auth]
+    try:
+        modules.append(importlib.import_module("botocore.crt.auth"))
+    except ImportError:
+        pass
+    return modules
+
+
+@pytest.mark.parametrize(
+    "endpoint_url, region_name",
+    [(MINIO_ENDPOINT, None), (None, "eu-west-1")],
+)
+def test_batch_presigned_urls_match_single_urls(
+    mock_s3, monkeypatch, endpoint_url, region_name
+):
+    monkeypatch.delenv("AWS_REGION", raising=False)
+    monkeypatch.delenv("AWS_DEFAULT_REGION", raising=False)
+    # Sign every URL at the same instant so they can be compared verbatim
+    for module in _signing_modules():
+        monkeypatch.setattr(module, "get_current_datetime", _frozen_now)
+    storage = S3Storage(
+        bucket="presign-bucket", endpoint_url=endpoint_url, region_name=region_name
+    )
+    keys = [
+        "proj/videos/video.mp4",
+        "proj/notes/my notes (final).md",
+        "proj/frames/früh_ñ_日本.jpg",
+        "proj/odd/a+b=c&d~e%f.txt",
+    ]
+
+    presign_calls = []
+    presign = storage.client.generate_presigned_url
+
+    def counting_presign(*args, **kwargs):
+        presign_calls.append(kwargs["Params"]["Key"])
+        return presign(*args, **kwargs)
+
+    monkeypatch.setattr(storage.client, "generate_presigned_url", counting_presign)
+    urls = storage.generate_presigned_urls(keys, expiration=600)
+
+    # Only the first key goes through the client; the rest are signed locally
+    assert presign_calls == keys[:1]
+    assert urls == [storage.generate_presigned_url(key, 600) for key in keys]
@@ -0,0 +1,82 @@
+import asyncio
+
+from app.routes.run import _throttle_events
+
+
+def _events(*phases, delay=0.0):
+    async def gen():
+        for i, phase in enumerate(phases):
+            if delay:
+                await asyncio.sleep(delay)
+            yield {"phase": phase, "progress": i}
+
+    return gen()
+
+
+def _collect(events, **kwargs):
+    async def run():
+        return [e async for e in _throttle_events(events, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_same_phase_burst_keeps_first_and_latest():
+    out = _collect(_events("chunk", "chunk", "chunk", "chunk"), min_interval=10)
+    assert [e["progress"] for e in out] == [0, 3]
+
+
+def test_phase_changes_and_terminal_events_pass_through():
+    phases = ("transcript", "chunk", "chunk", "chunk", "notes", "done")
+    out = _collect(_events(*phases), min_interval=10)
+    assert [e["phase"] for e in out] == ["transcript", "chunk", "notes", "done"]
+    # The held-back chunk event (progress 3) is dropped by the phase change
+    assert [e["progress"] for e in out] == [0, 1, 4, 5]
+
+
+def test_update_events_are_never_dropped():
+    async def gen():
+        for i in range(4):
+            mode = "updates" if i % 2 else "values"
+            yield {"phase": "chunk", "progress": i, "stream": {"mode": mode}}
+
+    out = _collect(gen(), min_interval=10)
+    assert [e["progress"] for e in out] == [0, 1, 3]
+
+
+def test_held_back_event_is_flushed_while_source_is_idle():
+    async def gen():
+        yield {"phase": "chunk", "progress": 0}
+        yield {"phase": "chunk", "progress": 1}
+        await asyncio.sleep(0.2)
+        yield {"phase": "done", "progress": 2}
+
+    async def run():
+        received = []
+        async for event in _throttle_events(gen(), min_interval=0.05):
+            received.append((event["progress"], asyncio.get_running_loop().time()))
+        return received
+
+    received = asyncio.run(run())
+    assert [p for p, _ in received] == [0, 1, 2]
+    # Event 1 arrived well before the idle source produced "done"
+    assert received[2][1] - received[1][1] > 0.1
+
+
+def test_closing_the_throttle_closes_the_source():
+    closed = []
+
+    async def gen():
+        try:
+            while True:
+                yield {"phase": "chunk"}
+                await asyncio.sleep(0.01)
+        finally:
+            closed.append(True)
+
+    async def run():
+        throttled = _throttle_events(gen(), min_interval=0.0)
+        await throttled.__anext__()
+        await throttled.aclose()
+
+    asyncio.run(run())
+    assert closed == [True]
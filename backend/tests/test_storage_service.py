@@ -0,0 +1,162 @@
+import gzip
+import io
+from pathlib import Path
+
+from app.services.storage_service import (
+    ARTIFACT_FRAMES,
+    ARTIFACT_NOTES,
+    ARTIFACT_TRANSCRIPTS,
+    ARTIFACT_VIDEOS,
+    GZIP_LEVEL,
+)
+
+
+def test_video_stream_upload_reaches_endpoint_bucket(storage_service):
+    video = b"\x00\x00\x00\x18ftypmp42" + b"\x01" * (9 * 1024 * 1024)
+    key = storage_service.upload_video_stream("alice", "proj", io.BytesIO(video))
+
+    storage = storage_service._get_user_storage("alice")
+    assert storage.client.meta.endpoint_url.startswith("http://minio.test")
+    head = storage.client.head_object(Bucket=storage.bucket, Key=key)
+    assert head["ContentLength"] == len(video)
+    assert head["ContentType"] == "video/mp4"
+    assert (
+        storage_service.download_file("alice", "proj", ARTIFACT_VIDEOS, "video.mp4")
+        == video
+    )
+
+
+def test_text_artifacts_round_trip_gzip(storage_service, tmp_path):
+    notes = ("# Notes\n\n" + "Some repeated text. " * 500).encode()
+    key = storage_service.upload_notes("alice", "proj", "final_notes.md", notes)
+
+    storage = storage_service._get_user_storage("alice")
+    head = storage.head(key)
+    assert head["ContentEncoding"] == "gzip"
+    assert head["ContentLength"] < len(notes)
+
+    assert (
+        storage_service.download_file("alice", "proj", ARTIFACT_NOTES, "final_notes.md")
+        == notes
+    )
+    raw, encoding = storage_service.download_file_encoded(
+        "alice", "proj", ARTIFACT_NOTES, "final_notes.md", decompress=False
+    )
+    assert encoding == "gzip"
+    assert gzip.decompress(raw) == notes
+
+    local = storage_service.download_to_temp(
+        "alice", "proj", ARTIFACT_NOTES, "final_notes.md"
+    )
+    assert Path(local).read_bytes() == notes
+    Path(local).unlink()
+
+
+def test_gzip_magic_in_unencoded_object_is_left_alone(storage_service, tmp_path):
+    # A binary artifact that happens to start with the gzip magic bytes
+    data = b"\x1f\x8b" + b"not really gzip"
+    storage_service.upload_notes("alice", "proj", "blob.pdf", data)
+
+    assert (
+        storage_service.download_file("alice", "proj", ARTIFACT_NOTES, "blob.pdf")
+        == data
+    )
+    assert storage_service.download_file_encoded(
+        "alice", "proj", ARTIFACT_NOTES, "blob.pdf", decompress=False
+    ) == (data, None)
+    path = storage_service.download_file_to_path(
+        "alice", "proj", ARTIFACT_NOTES, "blob.pdf", str(tmp_path / "blob.pdf")
+    )
+    assert Path(path).read_bytes() == data
+
+
+def test_artifact_sizes_come_from_the_listing(storage_service, monkeypatch):
+    transcript = b'{"segments": [' + b'{"text": "hello"},' * 1000 + b"{}]}"
+    storage_service.upload_transcript("alice", "proj", transcript)
+    storage_service.upload_notes("alice", "proj", "final_notes.pdf", b"%PDF" * 10)
+    storage_service.upload_frame("alice", "proj", "frame.jpg", b"\xff\xd8" * 50)
+    storage = storage_service._get_user_storage("alice")
+    heads = _count_calls(monkeypatch, storage, "head")
+
+    sizes = storage_service.get_artifact_sizes("alice", "proj")
+    assert heads == []
+    # Gzip-stored text counts with its stored size
+    stored = gzip.compress(transcript, compresslevel=GZIP_LEVEL, mtime=0)
+    assert sizes[ARTIFACT_TRANSCRIPTS] == len(stored) < len(transcript)
+    assert sizes[ARTIFACT_NOTES] == 40
+    assert sizes[ARTIFACT_FRAMES] == 100
+
+
+def test_copy_notes_copies_whole_run(storage_service):
+    storage_service.upload_notes("alice", "proj", "final_notes.md", "# Hi", run_id="r1")
+    storage_service.upload_notes(
+        "alice", "proj", "partial/timestamps_chunk_0.json", "{}", run_id="r1"
+    )
+
+    keys = storage_service.copy_notes("alice", "proj", "r1", "r2")
+    assert sorted(keys) == [
+        "proj/notes/r2/final_notes.md",
+        "proj/notes/r2/partial/timestamps_chunk_0.json",
+    ]
+    assert (
+        storage_service.download_file(
+            "alice", "proj", ARTIFACT_NOTES, "final_notes.md", run_id="r2"
+        )
+        == b"# Hi"
+    )
+
+
+def _count_calls(monkeypatch, obj, name):
+    calls = []
+    method = getattr(obj, name)
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return method(*args, **kwargs)
+
+    monkeypatch.setattr(obj, name, counting)
+    return calls
+
+
+def test_transcript_cache_is_invalidated_on_upload(storage_service, monkeypatch):
+    storage_service.upload_transcript("alice", "proj", b'{"v": 1}')
+    reads = _count_calls(
+        monkeypatch, storage_service._get_user_storage("alice"), "read_object"
+    )
+
+    assert storage_service.get_transcript("alice", "proj") == b'{"v": 1}'
+    assert storage_service.get_transcript("alice", "proj") == b'{"v": 1}'
+    assert len(reads) == 1
+
+    storage_service.upload_transcript("alice", "proj", b'{"v": 2}')
+    assert storage_service.get_transcript("alice", "proj") == b'{"v": 2}'
+    assert len(reads) == 2
+
+
+def test_file_exists_caches_hits_and_misses(storage_service, monkeypatch):
+    storage = storage_service._get_user_storage("alice")
+    heads = _count_calls(monkeypatch, storage, "exists")
+
+    assert not storage_service.file_exists("alice", "proj", ARTIFACT_FRAMES, "f.jpg")
+    assert not storage_service.file_exists("alice", "proj", ARTIFACT_FRAMES, "f.jpg")
+    assert len(heads) == 1
+
+    # Writing through the service replaces the cached miss with a hit
+    storage_service.upload_frame("alice", "proj", "f.jpg", b"\xff\xd8")
+    assert storage_service.file_exists("alice", "proj", ARTIFACT_FRAMES, "f.jpg")
+    assert len(heads) == 1
+
+
+def test_deletes_invalidate_cached_entries(storage_service):
+    storage_service.upload_frame("alice", "proj", "f.jpg", b"\xff\xd8")
+    storage_service.upload_transcript("alice", "proj", b"{}")
+    storage_service.upload_frame("alice", "other", "f.jpg", b"\xff\xd8")
+    assert storage_service.get_transcript("alice", "proj") == b"{}"
+
+    storage_service.delete_file("alice", "proj", ARTIFACT_FRAMES, "f.jpg")
+    assert not storage_service.file_exists("alice", "proj", ARTIFACT_FRAMES, "f.jpg")
+
+    storage_service.delete_project_artifacts("alice", "proj")
+    assert storage_service.get_transcript("alice", "proj") is None
+    # Other projects' entries survive a prefix invalidation
+    assert ("alice", "other/frames/f.jpg") in storage_service._exists_cache